@@ -78,3 +78,9 @@ class SetPasswordForm(authforms.SetPasswordForm):
             Field("new_password2", placeholder="Enter new password (again)"),
             Submit("pass_change", "Change Password", css_class="btn-warning"),
         )
+
+
+class ProvisionUsersForm(forms.Form):
+    csv_file = forms.FileField(label="CSV file", help_text="One email,name pair per line.")
+    password = forms.CharField(required=False, widget=forms.PasswordInput,
+                               help_text="Leave empty to let everyone set theirs through a password reset.")
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.provisioning import BATCH_SIZE, ProvisioningError, provisionUsers, readPeople
+
+
+class Command(BaseCommand):
+    help = "Creates accounts, with their actors and profiles, for every email,name line of a CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_file")
+        parser.add_argument("--password", default=None,
+                            help="Password of every new account. Without one they are claimed by a password reset.")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["csv_file"], encoding="utf-8-sig", newline="") as file:
+                people, errors = readPeople(file)
+        except OSError as error:
+            raise CommandError(error)
+
+        for error in errors:
+            self.stderr.write(error)
+        try:
+            result = provisionUsers(people, options["password"], options["batch_size"])
+        except ProvisioningError as error:
+            raise CommandError(str(error) + ". Nothing was created, run the command again.")
+        for email in result.skipped:
+            self.stdout.write("Skipped " + email + ", it already has an account.")
+        self.stdout.write(self.style.SUCCESS("Created " + str(len(result.created)) + " users."))
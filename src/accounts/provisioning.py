@@ -0,0 +1,125 @@
+import csv
+import io
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, connection, transaction
+from django.db.models.functions import Lower
+
+from conferences.models import Actor
+from iss.logger import logger
+from profiles.models import Profile
+
+User = get_user_model()
+
+BATCH_SIZE = 1000
+
+
+class ProvisioningError(Exception):
+    """Some emails got an account from elsewhere while the batch was being written; nothing was created."""
+
+    def __init__(self, emails):
+        super().__init__("These emails were registered while provisioning: " + ", ".join(emails))
+        self.emails = emails
+
+
+class ProvisionResult(object):
+    def __init__(self, created, skipped):
+        self.created = created  # the new users, primary keys set
+        self.skipped = skipped  # emails that already had an account or were listed twice
+
+
+def readPeople(file):
+    """(email, name) pairs and the rejected lines of a CSV with an email and a name column.
+
+    A first line naming the columns is optional.
+    """
+    if isinstance(file, bytes):
+        file = file.decode('utf-8-sig')
+    if isinstance(file, str):
+        file = io.StringIO(file)
+
+    people, errors = [], []
+    for number, row in enumerate(csv.reader(file), 1):
+        row = [cell.strip() for cell in row]
+        if not any(row):
+            continue
+        if number == 1 and row[0].lower() == 'email':
+            continue
+        if len(row) < 2 or not row[1]:
+            errors.append("Line {}: an email and a name are required.".format(number))
+            continue
+        try:
+            validate_email(row[0])
+        except ValidationError:
+            errors.append("Line {}: {} is not a valid email.".format(number, row[0]))
+            continue
+        people.append((row[0], row[1]))
+    return people, errors
+
+
+def chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def lookupSize(batchSize):
+    # how many values fit in one IN (...) on this backend
+    return max(1, min(batchSize, connection.ops.bulk_batch_size(['email'], [None] * batchSize)))
+
+
+def existingEmails(keys, batchSize=BATCH_SIZE):
+    """The emails of the accounts matching the lower-cased ``keys``, whatever their case."""
+    for batch in chunks(keys, lookupSize(batchSize)):
+        yield from User.objects.annotate(key=Lower('email')).filter(key__in=batch).values_list('email', flat=True)
+
+
+def provisionUsers(people, password=None, batchSize=BATCH_SIZE):
+    """Creates a user, an actor and a profile for each (email, name) pair.
+
+    This is what saving the users one by one would do through the post_save
+    handlers of conferences and profiles, but in three batched INSERTs inside a
+    single transaction. Emails that already have an account are skipped. Without
+    a password the accounts get an unusable one and are claimed through the
+    password reset page.
+    """
+    unique = {}
+    skipped = []
+    for email, name in people:
+        email = User.objects.normalize_email(email)
+        if email.lower() in unique:
+            skipped.append(email)
+        else:
+            unique[email.lower()] = (email, name)
+
+    for existing in existingEmails(list(unique), batchSize):
+        skipped.append(existing)
+        unique.pop(existing.lower(), None)
+
+    # hashing is deliberately slow: do it once and share the hash
+    hashed = make_password(password) if password else None
+    users = [User(email=email, name=name, password=hashed or make_password(None))
+             for email, name in unique.values()]
+
+    try:
+        with transaction.atomic():
+            # bulk_create splits the rows into what the backend accepts (SQLite caps the row count)
+            User.objects.bulk_create(users)
+            if users and users[0].pk is None:
+                # only some backends hand the new primary keys back
+                ids = {}
+                for batch in chunks([user.email for user in users], lookupSize(batchSize)):
+                    ids.update(User.objects.filter(email__in=batch).values_list('email', 'id'))
+                for user in users:
+                    user.pk = ids[user.email]
+
+            Actor.objects.bulk_create([Actor(user_id=user.pk) for user in users])
+            Profile.objects.bulk_create([Profile(user_id=user.pk) for user in users])
+    except IntegrityError:
+        # someone registered one of the emails after the check above
+        raise ProvisioningError(list(existingEmails(list(unique), batchSize)) or list(unique))
+
+    logger.info("Provisioned {} users, skipped {}", len(users), len(skipped))
+    return ProvisionResult(users, skipped)
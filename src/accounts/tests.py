@@ -1 +1,89 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
 from django.test import TestCase
+
+from conferences.models import Actor
+from profiles.models import Profile
+
+from .provisioning import ProvisioningError, provisionUsers, readPeople
+
+User = get_user_model()
+
+
+class ProvisionUsersTest(TestCase):
+    def test_every_user_gets_an_actor_and_a_profile(self):
+        # more rows than SQLite takes in one INSERT or one IN (...)
+        people = [("person-{}@example.com".format(n), "Person {}".format(n)) for n in range(600)]
+
+        result = provisionUsers(people)
+
+        self.assertEqual(len(result.created), 600)
+        self.assertEqual(result.skipped, [])
+        self.assertEqual(User.objects.count(), 600)
+        self.assertEqual(Actor.objects.count(), 600)
+        self.assertEqual(Profile.objects.count(), 600)
+        self.assertEqual({user.pk for user in result.created}, set(User.objects.values_list('pk', flat=True)))
+        self.assertFalse(User.objects.get(email="person-7@example.com").has_usable_password())
+
+    def test_existing_and_repeated_emails_are_skipped_whatever_their_case(self):
+        User.objects.create_user("Alice@example.com", "secret", name="Alice")
+
+        result = provisionUsers([("alice@example.com", "Alice again"), ("bob@example.com", "Bob"),
+                                 ("BOB@example.com", "Bob again")])
+
+        self.assertEqual([user.email for user in result.created], ["bob@example.com"])
+        self.assertCountEqual(result.skipped, ["Alice@example.com", "BOB@example.com"])
+        self.assertEqual(User.objects.count(), 2)
+
+    def test_the_password_is_shared(self):
+        result = provisionUsers([("carol@example.com", "Carol"), ("dave@example.com", "Dave")], password="shared")
+        for user in User.objects.filter(pk__in=[user.pk for user in result.created]):
+            self.assertTrue(user.check_password("shared"))
+
+    def test_a_concurrent_registration_creates_nothing(self):
+        User.objects.create_user("erin@example.com", "secret", name="Erin")
+        # the first lookup misses Erin, as if she registered right after it
+        with mock.patch("accounts.provisioning.existingEmails",
+                        side_effect=[iter([]), iter(["erin@example.com"])]):
+            with self.assertRaises(ProvisioningError) as raised:
+                provisionUsers([("erin@example.com", "Erin"), ("frank@example.com", "Frank")])
+
+        self.assertEqual(raised.exception.emails, ["erin@example.com"])
+        self.assertFalse(User.objects.filter(email="frank@example.com").exists())
+
+
+class ReadPeopleTest(TestCase):
+    def test_header_blank_and_bad_lines(self):
+        people, errors = readPeople(b"\xef\xbb\xbfemail,name\n"
+                                    b"grace@example.com, Grace \n"
+                                    b"\n"
+                                    b"not-an-email,Nobody\n"
+                                    b"heidi@example.com\n")
+        self.assertEqual(people, [("grace@example.com", "Grace")])
+        self.assertEqual(errors, ["Line 4: not-an-email is not a valid email.",
+                                  "Line 5: an email and a name are required."])
+
+
+class ProvisionUsersCommandTest(TestCase):
+    def test_command(self):
+        file = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+        self.addCleanup(os.remove, file.name)
+        with file:
+            file.write("ivan@example.com,Ivan\njudy@example.com,Judy\n")
+        User.objects.create_user("judy@example.com", "secret", name="Judy")
+
+        out = StringIO()
+        call_command("provision_users", file.name, stdout=out)
+
+        self.assertIn("Skipped judy@example.com, it already has an account.", out.getvalue())
+        self.assertIn("Created 1 users.", out.getvalue())
+        self.assertTrue(User.objects.filter(email="ivan@example.com").exists())
+
+    def test_missing_file(self):
+        with self.assertRaises(CommandError):
+            call_command("provision_users", os.path.join(tempfile.gettempdir(), "no-such-people.csv"))
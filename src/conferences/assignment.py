@@ -0,0 +1,217 @@
+from heapq import heappop, heappush
+
+from django.db import transaction
+
+from . import models
+from .bidding import BiddingMatrix
+from .cache import forgetSubmissionDetails
+
+# how much each bid costs when turned into an assignment; refusals never become one
+BID_COSTS = {
+    0: 0,  # Want to Evaluate
+    1: 1,  # Neutral
+}
+
+
+class MinCostFlow(object):
+    """Min-cost max-flow by the primal-dual method.
+
+    Each phase runs Dijkstra on reduced costs to update the node potentials,
+    then pushes a blocking flow (Dinic) through the edges whose reduced cost
+    is zero. With the handful of distinct bid costs there are only a few phases.
+    """
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.head = [-1] * nodes
+        self.to = []
+        self.cap = []
+        self.cost = []
+        self.next = []
+
+    def addEdge(self, u, v, capacity, cost):
+        # edges are stored in pairs, so the residual twin of edge e is e ^ 1
+        edge = len(self.to)
+        self.to += [v, u]
+        self.cap += [capacity, 0]
+        self.cost += [cost, -cost]
+        self.next += [self.head[u], self.head[v]]
+        self.head[u] = edge
+        self.head[v] = edge + 1
+        return edge
+
+    def flow(self, edge):
+        return self.cap[edge ^ 1]
+
+    def solve(self, source, sink):
+        potential = [0] * self.nodes
+        total = 0
+        while self._updatePotential(source, sink, potential):
+            while True:
+                level = self._levels(source, sink, potential)
+                if level[sink] < 0:
+                    break
+                total += self._blockingFlow(source, sink, potential, level)
+        return total
+
+    def _updatePotential(self, source, sink, potential):
+        head, to, cap, cost, nxt = self.head, self.to, self.cap, self.cost, self.next
+        infinity = float('inf')
+        dist = [infinity] * self.nodes
+        done = [False] * self.nodes
+        dist[source] = 0
+        heap = [(0, source)]
+
+        while heap:
+            d, u = heappop(heap)
+            if done[u]:
+                continue
+            done[u] = True
+            if u == sink:
+                break
+            base = d + potential[u]
+            e = head[u]
+            while e != -1:
+                if cap[e] > 0:
+                    v = to[e]
+                    nd = base + cost[e] - potential[v]
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        heappush(heap, (nd, v))
+                e = nxt[e]
+
+        if not done[sink]:
+            return False
+
+        reach = dist[sink]
+        for v in range(self.nodes):
+            potential[v] += dist[v] if done[v] else reach
+        return True
+
+    def _admissible(self, e, u, potential):
+        return self.cap[e] > 0 and self.cost[e] + potential[u] - potential[self.to[e]] == 0
+
+    def _levels(self, source, sink, potential):
+        head, to, nxt = self.head, self.to, self.next
+        level = [-1] * self.nodes
+        level[source] = 0
+        queue = [source]
+        for u in queue:
+            if u == sink:
+                break
+            e = head[u]
+            while e != -1:
+                v = to[e]
+                if level[v] < 0 and self._admissible(e, u, potential):
+                    level[v] = level[u] + 1
+                    queue.append(v)
+                e = nxt[e]
+        return level
+
+    def _blockingFlow(self, source, sink, potential, level):
+        to, cap, nxt = self.to, self.cap, self.next
+        current = list(self.head)
+        total = 0
+
+        while True:
+            path = []
+            u = source
+            while u != sink:
+                e = current[u]
+                while e != -1:
+                    v = to[e]
+                    if level[v] == level[u] + 1 and self._admissible(e, u, potential):
+                        break
+                    e = nxt[e]
+                current[u] = e
+
+                if e != -1:
+                    path.append(e)
+                    u = to[e]
+                    continue
+
+                # dead end: never come back here in this phase
+                if u == source:
+                    return total
+                level[u] = -1
+                e = path.pop()
+                u = to[e ^ 1]
+                current[u] = nxt[e]
+
+            pushed = min(cap[e] for e in path)
+            for e in path:
+                cap[e] -= pushed
+                cap[e ^ 1] += pushed
+            total += pushed
+
+
+def solveAssignment(papers, members, cost, demand, capacity):
+    """Pick reviewers for papers.
+
+    ``cost(i, j)`` is the price of giving paper ``i`` to member ``j`` or
+    ``None`` when that pair is not allowed; ``demand[i]`` is how many more
+    reviewers paper ``i`` needs and ``capacity[j]`` how many more papers member
+    ``j`` may take. Returns (paper index, member index) pairs covering as many
+    of the demands as possible at the lowest total cost.
+    """
+    source, sink = 0, 1
+    paperNode = 2
+    memberNode = paperNode + papers
+    network = MinCostFlow(memberNode + members)
+
+    for j in range(members):
+        if capacity[j] > 0:
+            network.addEdge(memberNode + j, sink, capacity[j], 0)
+
+    pairs = []
+    for i in range(papers):
+        if demand[i] <= 0:
+            continue
+        network.addEdge(source, paperNode + i, demand[i], 0)
+        for j in range(members):
+            if capacity[j] <= 0:
+                continue
+            price = cost(i, j)
+            if price is not None:
+                pairs.append((network.addEdge(paperNode + i, memberNode + j, 1, price), i, j))
+
+    network.solve(source, sink)
+    return [(i, j) for edge, i, j in pairs if network.flow(edge)]
+
+
+def autoAssignReviewers(conference, reviewersPerPaper, maxLoad):
+    matrix = BiddingMatrix(conference)
+    submissions = matrix.submissions
+    # the chair never reviews
+    members = [member for member in matrix.members if member.actor_id != conference.chairedBy_id]
+
+    existing = set(models.ReviewAssignment.objects.filter(submission__conference_id=conference.id)
+                   .values_list('submission_id', 'pcmember_id'))
+    demand = [reviewersPerPaper] * len(submissions)
+    capacity = [maxLoad] * len(members)
+    submissionIndex = {submission.id: i for i, submission in enumerate(submissions)}
+    memberIndex = {member.id: j for j, member in enumerate(members)}
+    for submissionId, memberId in existing:
+        if submissionId in submissionIndex:
+            demand[submissionIndex[submissionId]] -= 1
+        if memberId in memberIndex:
+            capacity[memberIndex[memberId]] -= 1
+
+    def cost(i, j):
+        submission, member = submissions[i], members[j]
+        if submission.submitter_id == member.actor_id or (submission.id, member.id) in existing:
+            return None
+        return BID_COSTS.get(matrix.value(member.id, submission.id))
+
+    pairs = solveAssignment(len(submissions), len(members), cost, demand, capacity)
+
+    with transaction.atomic():
+        models.ReviewAssignment.objects.bulk_create([
+            models.ReviewAssignment(submission=submissions[i], pcmember=members[j],
+                                    grade=models.GradingValues.DEFAULT)
+            for i, j in pairs
+        ])
+        # bulk_create sends no signals
+        models.GradeAggregate.record([(submissions[i].id, None, models.GradingValues.DEFAULT) for i, _ in pairs])
+    forgetSubmissionDetails({submissions[i].id for i, _ in pairs})
+    return len(pairs)
@@ -0,0 +1,64 @@
+from . import models
+
+
+class BiddingMatrix(object):
+    """Dense (member, submission) -> bid table for one conference.
+
+    All the bids are fetched with a single query, restricted to the given
+    members and submissions, so looking up a cell never touches the DB.
+    """
+
+    def __init__(self, conference, members=None, submissions=None):
+        # the whole panel needs no IN (...) lists, the conference already bounds the bids
+        restrictMembers = members is not None
+        restrictSubmissions = submissions is not None
+        if members is None:
+            members = conference.pcmemberin_set.select_related('actor__user').order_by('id')
+        if submissions is None:
+            submissions = conference.submission_set.order_by('id')
+
+        self.members = list(members)
+        self.submissions = list(submissions)
+        self.memberIndex = {member.id: i for i, member in enumerate(self.members)}
+        self.submissionIndex = {submission.id: j for j, submission in enumerate(self.submissions)}
+
+        width = len(self.submissions)
+        self.cells = [[None] * width for _ in self.members]
+
+        bids = models.Bidding.objects.filter(submission__conference_id=conference.id)
+        if restrictMembers:
+            bids = bids.filter(pcmember_id__in=list(self.memberIndex))
+        if restrictSubmissions:
+            bids = bids.filter(submission_id__in=list(self.submissionIndex))
+
+        for member_id, submission_id, bid in bids.values_list('pcmember_id', 'submission_id', 'bid'):
+            i = self.memberIndex.get(member_id)
+            j = self.submissionIndex.get(submission_id)
+            if i is not None and j is not None:
+                self.cells[i][j] = bid
+
+    @classmethod
+    def forPair(cls, submission, member):
+        return cls(submission.conference, members=[member], submissions=[submission])
+
+    def value(self, member_id, submission_id):
+        i = self.memberIndex.get(member_id)
+        j = self.submissionIndex.get(submission_id)
+        if i is None or j is None or self.cells[i][j] is None:
+            return models.BiddingValues.DEFAULT
+        return self.cells[i][j]
+
+    def hasBid(self, member_id, submission_id):
+        i = self.memberIndex.get(member_id)
+        j = self.submissionIndex.get(submission_id)
+        return i is not None and j is not None and self.cells[i][j] is not None
+
+    def label(self, member_id, submission_id):
+        return models.BiddingValues.LABELS[self.value(member_id, submission_id)]
+
+    def opinions(self, member):
+        row = self.cells[self.memberIndex[member.id]]
+        labels = models.BiddingValues.LABELS
+        default = models.BiddingValues.N
+        return [{'id': submission.id, 'value': labels.label(bid, default)}
+                for submission, bid in zip(self.submissions, row)]
@@ -0,0 +1,66 @@
+from django.core.cache import cache
+
+CONFERENCE_VERSION_KEY = 'conferences:version'
+
+
+def conferenceVersion():
+    # bumped on every conference change, so fragments keyed on it never go stale
+    cache.add(CONFERENCE_VERSION_KEY, 1, None)
+    return cache.get(CONFERENCE_VERSION_KEY, 1)
+
+
+def bumpConferenceVersion():
+    try:
+        cache.incr(CONFERENCE_VERSION_KEY)
+    except ValueError:
+        cache.set(CONFERENCE_VERSION_KEY, 1, None)
+
+
+def capabilityKey(actorId, conferenceId, version=None):
+    # a conference change bumps the version, which retires every key of the old one
+    return 'conferences:capabilities:{}:{}:{}'.format(version or conferenceVersion(), actorId, conferenceId)
+
+
+def forgetCapabilities(actorId, conferenceId):
+    cache.delete(capabilityKey(actorId, conferenceId))
+
+
+SECTION_VERSION_KEY = 'conferences:sections:version'
+SECTION_TIMEOUT = 60 * 60
+
+
+def sectionVersion():
+    cache.add(SECTION_VERSION_KEY, 1, None)
+    return cache.get(SECTION_VERSION_KEY, 1)
+
+
+def bumpSectionVersion():
+    # a section write (or delete, which also drops its conference links) retires every section key
+    try:
+        cache.incr(SECTION_VERSION_KEY)
+    except ValueError:
+        cache.set(SECTION_VERSION_KEY, 1, None)
+
+
+def sectionIndexKey(version=None):
+    return 'conferences:sections:{}:index'.format(version or sectionVersion())
+
+
+def conferenceSectionsKey(conferenceId, version=None):
+    return 'conferences:sections:{}:conference:{}'.format(version or sectionVersion(), conferenceId)
+
+
+def forgetConferenceSections(conferenceIds):
+    version = sectionVersion()
+    cache.delete_many([conferenceSectionsKey(id, version) for id in conferenceIds])
+
+
+SUBMISSION_DETAIL_TIMEOUT = 60 * 60
+
+
+def submissionDetailKey(submissionId):
+    return 'conferences:submission-detail:{}'.format(submissionId)
+
+
+def forgetSubmissionDetails(submissionIds):
+    cache.delete_many([submissionDetailKey(id) for id in submissionIds])
@@ -0,0 +1,93 @@
+import datetime
+
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
+
+from . import models
+from .cache import capabilityKey, conferenceVersion
+
+CAPABILITY_TIMEOUT = 60 * 60
+
+ABSTRACTS = 'abstracts'
+SUBMISSIONS = 'submissions'
+BIDDING = 'bidding'
+REVIEWING = 'reviewing'
+PRESENTATIONS = 'presentations'
+FINISHED = 'finished'
+
+
+def phaseOf(conference, today):
+    # which deadline comes next
+    if today < conference.abstract_date:
+        return ABSTRACTS
+    if today < conference.submission_date:
+        return SUBMISSIONS
+    if today < conference.bidding_date:
+        return BIDDING
+    if today < conference.presentation_date:
+        return REVIEWING
+    if today <= conference.end_date:
+        return PRESENTATIONS
+    return FINISHED
+
+
+class Capabilities(object):
+    """What the logged actor may do with one conference, as the views would decide it."""
+
+    def __init__(self, conference, actor, isPCMember, isAuthor, isAttendee, today):
+        self.isChair = conference.chairedBy_id == actor.id
+        self.isPCMember = isPCMember
+        self.isAuthor = isAuthor
+        self.isAttendee = isAttendee
+        self.phase = phaseOf(conference, today)
+
+        running = not conference.evaluated
+        self.canSubmit = not self.isChair and self.phase == ABSTRACTS
+        self.canEnroll = not self.isChair and not isPCMember
+        self.canSeeSubmissions = True
+        self.canSeePCMembers = self.isChair
+        self.canPostpone = self.isChair and running
+        self.canReview = isPCMember
+        self.canSeeResults = isPCMember and conference.evaluated
+        self.canEvaluate = self.isChair and running
+
+    @property
+    def key(self):
+        # what the rendered row depends on, for the template fragment cache
+        return ''.join('1' if allowed else '0' for allowed in (
+            self.isChair, self.canSubmit, self.canEnroll, self.canSeeSubmissions, self.canSeePCMembers,
+            self.canPostpone, self.canReview, self.canSeeResults, self.canEvaluate))
+
+
+def _roleFlags(actor, conferenceIds):
+    # every role of the actor in every listed conference, in a single query
+    rows = models.Conference.objects.filter(id__in=conferenceIds).annotate(
+        member=Exists(models.PcMemberIn.objects.filter(conference_id=OuterRef('pk'), actor_id=actor.id)),
+        author=Exists(models.Submission.objects.filter(conference_id=OuterRef('pk'), submitter_id=actor.id)),
+        attendee=Exists(models.Participants.objects.filter(paper__conference_id=OuterRef('pk'),
+                                                           actor_id=actor.id)),
+    ).values_list('id', 'member', 'author', 'attendee')
+    return {id: (member, author, attendee) for id, member, author, attendee in rows}
+
+
+def capabilityMap(actor, conferences, today=None):
+    """conference id -> Capabilities of the actor, for a list of conferences.
+
+    The role flags are cached per actor and conference and dropped whenever a
+    PC membership, submission or registration of that pair is written (and on
+    every conference change); the deadline phase is recomputed on each call.
+    """
+    today = today or datetime.date.today()
+    version = conferenceVersion()
+    keys = {conference.id: capabilityKey(actor.id, conference.id, version) for conference in conferences}
+    cached = cache.get_many(list(keys.values()))
+
+    flags = {id: cached[key] for id, key in keys.items() if key in cached}
+    missing = [id for id in keys if id not in flags]
+    if missing:
+        fresh = _roleFlags(actor, missing)
+        cache.set_many({keys[id]: fresh[id] for id in missing if id in fresh}, CAPABILITY_TIMEOUT)
+        flags.update(fresh)
+
+    return {conference.id: Capabilities(conference, actor, *flags[conference.id], today=today)
+            for conference in conferences if conference.id in flags}
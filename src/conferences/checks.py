@@ -0,0 +1,65 @@
+from django.db.models import Exists
+
+from .codes import Code, firstFailure
+
+
+class Pipeline(object):
+    """Ordered, lazy validation: in-memory checks, then database checks, then the action.
+
+    ``check`` adds a callable that answers from what is already loaded.
+    ``failIf``/``failUnless`` add a database check, a queryset whose
+    existence (or absence) fails with the given code. Those only run once
+    every in-memory check has passed, and then all together: each becomes an
+    EXISTS column on the single row of ``subject``, so they cost one query.
+    ``then`` adds the action itself, which may still fail (e.g. on a unique
+    index). The first failure stops everything after it.
+    """
+
+    def __init__(self, subject=None):
+        self.subject = subject
+        self.checks = []
+        self.queries = []
+        self.actions = []
+
+    def check(self, check):
+        self.checks.append(check)
+        return self
+
+    def failIf(self, queryset, code):
+        self.queries.append((queryset, True, code))
+        return self
+
+    def failUnless(self, queryset, code):
+        self.queries.append((queryset, False, code))
+        return self
+
+    def then(self, action):
+        self.actions.append(action)
+        return self
+
+    def run(self):
+        code = firstFailure(*self.checks)
+        if code == Code.OK:
+            code = self._query()
+        if code == Code.OK:
+            code = firstFailure(*self.actions)
+        return code
+
+    def _query(self):
+        if not self.queries:
+            return Code.OK
+
+        if self.subject is None:
+            answers = (queryset.exists() for queryset, _, _ in self.queries)
+        else:
+            names = ['check' + str(i) for i in range(len(self.queries))]
+            answers = self.subject.order_by().annotate(**{
+                name: Exists(queryset) for name, (queryset, _, _) in zip(names, self.queries)
+            }).values_list(*names).first()
+            if answers is None:
+                return Code.DOES_NOT_EXIST
+
+        for (queryset, failsIfFound, code), found in zip(self.queries, answers):
+            if found == failsIfFound:
+                return code
+        return Code.OK
@@ -0,0 +1,33 @@
+from django.db.models import Case, CharField, Value, When
+
+
+class Labels(object):
+    """Labels of a choice set whose values are 0, 1, 2, ...: an array indexed by value, and the reverse map.
+
+    ``annotation`` gives the same lookup as a SQL expression, so listings can
+    select the label with their rows instead of mapping them in Python.
+    """
+
+    def __init__(self, choices):
+        self.labels = tuple(label for value, label in choices)
+        if [value for value, label in choices] != list(range(len(self.labels))):
+            raise ValueError("choice values must be 0..n-1 in order")
+        self.values = {label: value for value, label in choices}
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, value):
+        return self.labels[value]
+
+    def label(self, value, default=None):
+        if value is None or not 0 <= value < len(self.labels):
+            return default
+        return self.labels[value]
+
+    def valueOf(self, label):
+        return self.values[label]
+
+    def annotation(self, field):
+        return Case(*[When(**{field: value}, then=Value(label)) for value, label in enumerate(self.labels)],
+                    output_field=CharField())
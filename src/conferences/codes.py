@@ -0,0 +1,87 @@
+from enum import Enum
+
+
+class Code(str, Enum):
+    """Outcome of a check or an action.
+
+    The values are the strings the checks used to return, so a Code still
+    compares equal to them (and serializes to them in JSON responses).
+    """
+
+    OK = "Ok"
+    DOES_NOT_EXIST = "doesNotExist"
+    NOT_CONFERENCE_CHAIR = "notConferenceChair"
+    ACTOR_IS_NOT_CONFERENCE_CHAIR = "actorIsNotConferenceChair"
+    CHAIR_OF_CONFERENCE = "chairOfConference"
+    NOT_PC_MEMBER = "notPCMember"
+    NOT_MEMBER_OF_CONFERENCE = "notMemberOfConference"
+    ALREADY_PC_MEMBER = "alreadyPCMember"
+    ACTOR_IS_SUBMISSION_AUTHOR = "actorIsSubmissionAuthor"
+    DATE_BEFORE = "dateBefore"
+    CHECK_DATES = "checkDates"
+    WEBSITE_NOT_OK = "websiteNotOk"
+    NAME_TAKEN = "nameTaken"
+    WEBSITE_TAKEN = "websiteTaken"
+    ALREADY_EXISTS = "alreadyExists"
+    ALREADY_BID = "alreadyBid"
+    BIDDING_NOT_OVER = "biddingNotOver"
+    REFUSED_TO_EVALUATE = "refusedToEvaluate"
+    ALREADY_ASSIGNED = "alreadyAssigned"
+    NOT_ASSIGNED = "notAssigned"
+    WRONG_MARK = "wrongMark"
+    NOT_ALL_GRADED = "notAllGraded"
+    ALREADY_EVALUATED = "alreadyEvaluated"
+    HAS_SECTION = "hasSection"
+    ALREADY_REGISTERED = "alreadyRegistered"
+    USER_DOES_NOT_EXIST = "userDoesNotExist"
+
+
+DEFAULT_MESSAGE = 'Some error occured!'
+
+MESSAGES = {
+    Code.NOT_CONFERENCE_CHAIR: 'You are not the chair!',
+    Code.DATE_BEFORE: 'You time-traveller...',
+    Code.DOES_NOT_EXIST: 'This required item does not exist!',
+    Code.CHECK_DATES: 'Make sure the conference ends after it starts and the abstract\'s '
+                      'deadline if before the full paper\'s deadline !',
+    Code.WEBSITE_NOT_OK: 'Make sure your website is correct ( http://www.[].[]!',
+    Code.NAME_TAKEN: 'There already is a conference with this name!',
+    Code.WEBSITE_TAKEN: 'There already is a conference with this website!',
+    Code.ALREADY_BID: 'You already have done a bid to this submission!',
+    Code.ALREADY_EXISTS: 'Item is already added!',
+    Code.ACTOR_IS_NOT_CONFERENCE_CHAIR: "The currently logged user is not the chair where the submission was made...",
+    Code.ACTOR_IS_SUBMISSION_AUTHOR: "The actor is the submission's author.",
+    Code.NOT_MEMBER_OF_CONFERENCE: "This is not a PC member of this conference.",
+    Code.CHAIR_OF_CONFERENCE: "The member is the chair of the conference.",
+    Code.ALREADY_ASSIGNED: "The member has already been assigned to review this paper.",
+    Code.REFUSED_TO_EVALUATE: "You should respect his decision of not voting this paper.",
+    Code.NOT_ASSIGNED: "You have not been assigned to review this paper.",
+    Code.WRONG_MARK: "You cannot assign this grade.",
+    Code.ALREADY_EVALUATED: "This conference has already been evaluated.",
+    Code.NOT_ALL_GRADED: "Not all submissions have been evaluated!",
+    Code.NOT_PC_MEMBER: "You are not a PC member!",
+    Code.ALREADY_PC_MEMBER: "You are already a PC member of this conference!",
+    Code.HAS_SECTION: "This submission is already in a section!",
+    Code.ALREADY_REGISTERED: "You already attend this paper!",
+    Code.USER_DOES_NOT_EXIST: "The user does not exist!",
+    Code.BIDDING_NOT_OVER: "The bidding period is not over yet!",
+}
+
+
+def messageFor(code):
+    try:
+        return MESSAGES.get(Code(code), DEFAULT_MESSAGE)
+    except ValueError:
+        return DEFAULT_MESSAGE
+
+
+def firstFailure(*checks):
+    """Runs the checks in order and returns the first code that is not OK, or OK.
+
+    Checks are callables, so nothing after the first failure is evaluated (or queried).
+    """
+    for check in checks:
+        code = check()
+        if code != Code.OK:
+            return Code(code)
+    return Code.OK
@@ -0,0 +1,42 @@
+from django.core.cache import cache
+from django.db.models import Prefetch, prefetch_related_objects
+
+from . import models
+from .cache import SUBMISSION_DETAIL_TIMEOUT, submissionDetailKey
+
+
+def _byMember(lookup, model):
+    # every row of the submission with its reviewer's user, joined in the same query
+    return Prefetch(lookup, queryset=model.objects.select_related('pcmember__actor__user').order_by('id'))
+
+
+def _row(item, **fields):
+    row = {'name': item.pcmember.actor.user.name, 'actorId': item.pcmember.actor_id}
+    row.update(fields)
+    return row
+
+
+def buildSubmissionDetail(submission):
+    prefetch_related_objects([submission],
+                             _byMember('bidding_set', models.Bidding),
+                             _byMember('submissionremark_set', models.SubmissionRemark),
+                             _byMember('reviewassignment_set', models.ReviewAssignment))
+    return {
+        'biddings': [_row(bid, bid=models.BiddingValues.LABELS.label(bid.bid)) for bid in submission.bidding_set.all()],
+        'remarks': [_row(remark, content=remark.content) for remark in submission.submissionremark_set.all()],
+        'grades': [_row(review, grade=models.GradingValues.LABELS.label(review.grade))
+                   for review in submission.reviewassignment_set.all()],
+    }
+
+
+def submissionDetail(submission):
+    """Bids, remarks and grades of a submission as plain rows, read through the cache.
+
+    Any write of a bid, remark or review assignment of the submission drops the cached copy.
+    """
+    key = submissionDetailKey(submission.id)
+    detail = cache.get(key)
+    if detail is None:
+        detail = buildSubmissionDetail(submission)
+        cache.set(key, detail, SUBMISSION_DETAIL_TIMEOUT)
+    return detail
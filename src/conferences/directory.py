@@ -0,0 +1,22 @@
+from . import models
+
+AUTOCOMPLETE_LIMIT = 10
+
+
+def conferenceMembers(conferenceId):
+    # the (conference, actor) unique index keeps this to the conference's own rows
+    return models.PcMemberIn.objects.filter(conference_id=conferenceId) \
+        .select_related('actor__user').order_by('actor__user__name')
+
+
+def memberNamed(conferenceId, name):
+    """The PC member of the conference whose user is called ``name``, or None, in one query."""
+    return models.PcMemberIn.objects.filter(conference_id=conferenceId, actor__user__name=name) \
+        .select_related('actor').order_by('id').first()
+
+
+def searchMembers(conferenceId, prefix, limit=AUTOCOMPLETE_LIMIT):
+    """Up to ``limit`` members of the conference whose name starts with ``prefix``, for autocompletion."""
+    rows = models.PcMemberIn.objects.filter(conference_id=conferenceId, actor__user__name__istartswith=prefix) \
+        .order_by('actor__user__name').values_list('id', 'actor__user__name', 'actor__user__email')[:limit]
+    return [{'id': id, 'name': name, 'email': email} for id, name, email in rows]
@@ -0,0 +1,129 @@
+import mimetypes
+import os
+import re
+import unicodedata
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# control characters cannot go in a header, quotes and backslashes would end the quoted filename
+UNSAFE_FILENAME_RE = re.compile(r'[\x00-\x1f\x7f"\\]+')
+# <upload_to>/<first two digits>/<sha256>.<extension>, as ContentAddressedStorage names its files
+DIGEST_RE = re.compile(r'(?:^|/)([0-9a-f]{2})/(\1[0-9a-f]{62})(?:\.[^/]*)?$')
+
+
+class RangeFile(object):
+    """Reads only `length` bytes of a file, starting at `start`."""
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parseRange(header, size):
+    """(start, end) of a single byte range, False if it lies past the end, None if there is no usable one."""
+    match = RANGE_RE.match(header or '')
+    if match is None or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        if int(last) == 0:
+            return False
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start >= size:
+        return False
+    return start, end
+
+
+def fileEtag(name, stat):
+    # content-addressed names already are a digest of the bytes; files stored before
+    # them keep the uploader's name, which says nothing about the content
+    match = DIGEST_RE.search(name)
+    if match is not None:
+        return quote_etag(match.group(2))
+    return quote_etag('{:x}-{:x}'.format(stat.st_size, stat.st_mtime_ns))
+
+
+def contentDisposition(downloadName):
+    """An inline Content-Disposition, with an RFC 5987 filename* when the name is not plain ASCII."""
+    name = UNSAFE_FILENAME_RE.sub(' ', downloadName).strip() or 'download'
+    fallback = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii').strip() or 'download'
+    value = 'inline; filename="' + fallback + '"'
+    if fallback != name:
+        value += "; filename*=UTF-8''" + quote(name, safe='')
+    return value
+
+
+def serveFile(request, storage, name, downloadName):
+    path = storage.path(name)
+    stat = os.stat(path)
+    size = stat.st_size
+    etag = fileEtag(name, stat)
+    contentType = mimetypes.guess_type(downloadName)[0] or 'application/octet-stream'
+
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is not None:
+        return response
+
+    backend = getattr(settings, 'SENDFILE_BACKEND', None)
+    if backend == 'x-accel-redirect':
+        # nginx streams the file (and handles ranges) from an internal location
+        response = HttpResponse(content_type=contentType)
+        response['X-Accel-Redirect'] = settings.SENDFILE_URL + quote(name)
+    elif backend == 'x-sendfile':
+        response = HttpResponse(content_type=contentType)
+        response['X-Sendfile'] = path
+    else:
+        response = streamFile(request, path, size, etag, contentType)
+
+    response['ETag'] = etag
+    response['Content-Disposition'] = contentDisposition(downloadName)
+    return response
+
+
+def streamFile(request, path, size, etag, contentType):
+    byteRange = None
+    # a stale If-Range means the client's partial copy is outdated: send everything
+    if request.META.get('HTTP_IF_RANGE', etag) == etag:
+        byteRange = parseRange(request.META.get('HTTP_RANGE'), size)
+
+    if byteRange is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = 'bytes */' + str(size)
+        return response
+
+    if byteRange is None:
+        # a real file object lets the WSGI server use its zero-copy sendfile path
+        response = FileResponse(open(path, 'rb'), content_type=contentType)
+        response['Content-Length'] = str(size)
+    else:
+        start, end = byteRange
+        response = FileResponse(RangeFile(open(path, 'rb'), start, end - start + 1), status=206,
+                                content_type=contentType)
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = 'bytes ' + str(start) + '-' + str(end) + '/' + str(size)
+    response['Accept-Ranges'] = 'bytes'
+    return response
@@ -0,0 +1,98 @@
+from django.db import transaction
+from django.db.models import BooleanField, Case, Count, F, Max, Min, Q, Sum, Value, When
+
+from . import models
+from .cache import bumpConferenceVersion
+from .codes import Code
+
+
+def reviewProgress(conference):
+    # graded vs. all review assignments of the conference, summed over the submission aggregates
+    progress = models.GradeAggregate.objects \
+        .filter(submission__conference_id=conference.id) \
+        .aggregate(allReviews=Sum('reviews'), gradedReviews=Sum('graded'))
+    progress = {'total': progress['allReviews'] or 0, 'graded': progress['gradedReviews'] or 0}
+    progress['percentage'] = percentage(progress['graded'], progress['total'])
+    return progress
+
+
+def percentage(part, whole):
+    if not whole:
+        return 100
+    return int(100 * part / whole)
+
+
+def finalGrades(conference):
+    rows = conference.submission_set.values_list('id', 'gradeaggregate__reviews', 'gradeaggregate__graded',
+                                                 'gradeaggregate__total')
+
+    grades = {}
+    for submissionId, reviews, graded, total in rows:
+        # a paper nobody reviewed cannot be evaluated either
+        if not reviews or graded != reviews:
+            return None
+        grades[submissionId] = total / graded
+    return grades
+
+
+def gradeConsensus(conference):
+    """The grade aggregates of a conference's submissions, most disputed first."""
+    aggregates = list(models.GradeAggregate.objects.filter(submission__conference_id=conference.id)
+                      .select_related('submission'))
+    # the ones nobody graded yet go last
+    aggregates.sort(key=lambda aggregate: (aggregate.variance is None, -(aggregate.variance or 0),
+                                           aggregate.submission_id))
+    return aggregates
+
+
+def rebuildGradeAggregates(submissions):
+    """Recomputes the aggregates of the given submissions from their review assignments.
+
+    For rows written without signals (bulk inserts); everything else keeps
+    the aggregates current as it goes.
+    """
+    graded = ~Q(grade=models.GradingValues.DEFAULT)
+    rows = models.ReviewAssignment.objects.filter(submission__in=submissions) \
+        .values('submission_id').order_by() \
+        .annotate(reviews=Count('id'), graded=Count('id', filter=graded), total=Sum('grade'),
+                  squares=Sum(F('grade') * F('grade')), lowest=Min('grade', filter=graded),
+                  highest=Max('grade', filter=graded))
+    totals = {row.pop('submission_id'): row for row in rows}
+
+    with transaction.atomic():
+        models.GradeAggregate.objects.filter(submission__in=submissions).delete()
+        models.GradeAggregate.objects.bulk_create([
+            models.GradeAggregate(submission_id=submissionId, **totals.get(submissionId, {}))
+            for submissionId in submissions.values_list('id', flat=True)
+        ])
+
+
+def isAccepted(finalGrade):
+    # i.e., borderline or better
+    return int(finalGrade) <= models.GradingValues.LABELS.valueOf(models.GradingValues.B)
+
+
+def closeEvaluation(conference):
+    with transaction.atomic():
+        grades = finalGrades(conference)
+        if grades is None:
+            return Code.NOT_ALL_GRADED
+
+        # flipping the flag first makes a concurrent close see the conference as already evaluated
+        if not models.Conference.objects.filter(id=conference.id, evaluated=False).update(evaluated=True):
+            return Code.ALREADY_EVALUATED
+
+        accepted = [submissionId for submissionId, grade in grades.items() if isAccepted(grade)]
+        conference.submission_set.update(result=Case(
+            When(id__in=accepted, then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField()
+        ))
+        models.EvaluationResult.objects.bulk_create([
+            models.EvaluationResult(submission_id=submissionId, grade=int(grade))
+            for submissionId, grade in grades.items()
+        ])
+
+    conference.evaluated = True
+    bumpConferenceVersion()
+    return Code.OK
@@ -4,6 +4,7 @@ from django.urls import reverse
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Submit, HTML, Field
 from . import models
+from .listing import STATUS_CHOICES
 
 
 class AddConference(forms.Form):
@@ -36,6 +37,25 @@ class AddConference(forms.Form):
         )
 
 
+class ConferenceFilter(forms.Form):
+    status = forms.ChoiceField(choices=STATUS_CHOICES, required=False)
+    starts_after = forms.DateField(required=False)
+    starts_before = forms.DateField(required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.helper = FormHelper()
+        self.helper.form_method = "get"
+        self.helper.form_class = "form-inline"
+
+        self.helper.layout = Layout(
+            Field("status"),
+            Field("starts_after", placeholder="Starting after"),
+            Field("starts_before", placeholder="Starting before"),
+            Submit("filter", "Filter", css_class="btn btn-primary"),
+        )
+
+
 class PostponeDeadlines(forms.Form):
     abstract_date = forms.DateField()
     submission_date = forms.DateField()
@@ -145,6 +165,21 @@ class BidSubmission(forms.Form):
         )
 
 
+class AutoAssignReviewers(forms.Form):
+    reviewers_per_paper = forms.IntegerField(min_value=1, initial=3)
+    max_load = forms.IntegerField(min_value=1, initial=10)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.helper = FormHelper()
+
+        self.helper.layout = Layout(
+            Field("reviewers_per_paper", placeholder="How many reviewers should each paper get?"),
+            Field("max_load", placeholder="How many papers can a PC member review at most?"),
+            Submit("auto_assign", "Assign the reviewers", css_class="btn btn-lg btn-primary btn-block")
+        )
+
+
 class CommentSubmission(forms.Form):
     remark = forms.CharField(max_length=1024)
 
@@ -192,12 +227,18 @@ class SessionChairAssignment(forms.Form):
     section_name = forms.CharField(max_length=128)
     pc_member_name = forms.CharField(max_length=128)
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, conference_id=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.helper = FormHelper()
 
+        # the names are suggested by the conference's member search as the chair types
+        memberAttrs = {"list": "pc-member-names", "autocomplete": "off"}
+        if conference_id is not None:
+            memberAttrs["data-search-url"] = reverse("pc-member-search", args=[conference_id])
+
         self.helper.layout = Layout(
             Field("section_name", placeholder="Section's name"),
-            Field("pc_member_name", placeholder="User's name"),
+            Field("pc_member_name", placeholder="User's name", **memberAttrs),
+            HTML('<datalist id="pc-member-names"></datalist>'),
             Submit("add_section", "Assign PC member as session chair", css_class="btn btn-lg btn-primary btn-block")
         )
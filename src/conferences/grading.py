@@ -0,0 +1,75 @@
+from django.db import transaction
+from django.db.models import Case, PositiveSmallIntegerField, Value, When
+
+from . import models
+from .cache import forgetSubmissionDetails
+from .codes import Code
+
+
+def parseGrades(pairs):
+    # (submission id, grade) pairs as they come from a form or a JSON body; None if any is not a number
+    grades = {}
+    try:
+        for submissionId, grade in pairs:
+            grades[int(submissionId)] = int(grade)
+    except (TypeError, ValueError):
+        return None
+    return grades
+
+
+def applyGrades(pcmember, grades):
+    """Grade many submissions at once for one PC member.
+
+    Everything is checked against the member's assignments, fetched with a
+    single query, and either all the grades are written or none is.
+    """
+    if pcmember is None:
+        return Code.NOT_PC_MEMBER
+
+    evaluate = pcmember.isChair()
+    if evaluate != Code.OK:
+        return evaluate
+
+    if any(grade < 1 or grade >= len(models.GradingValues.LABELS) for grade in grades.values()):
+        return Code.WRONG_MARK
+
+    assignments = {assignment.submission_id: assignment for assignment in
+                   pcmember.reviewassignment_set.filter(submission_id__in=list(grades))
+                   .select_related('submission')}
+
+    for submissionId in grades:
+        assignment = assignments.get(submissionId)
+        if assignment is None:
+            return Code.NOT_ASSIGNED
+        evaluate = assignment.submission.actorIsSubmissionAuthor(pcmember.actor)
+        if evaluate != Code.OK:
+            return evaluate
+
+    if not grades:
+        return Code.OK
+
+    ids = [assignment.id for assignment in assignments.values()]
+    with transaction.atomic():
+        # the grades being replaced, read again under lock so the aggregates move from the right values
+        before = dict(models.ReviewAssignment.objects.select_for_update().filter(id__in=ids)
+                      .values_list('submission_id', 'grade'))
+        models.ReviewAssignment.objects.filter(id__in=ids).update(grade=Case(
+            *[When(id=assignments[submissionId].id, then=Value(grade)) for submissionId, grade in grades.items()],
+            output_field=PositiveSmallIntegerField()
+        ))
+        models.GradeAggregate.record([(submissionId, before[submissionId], grade)
+                                      for submissionId, grade in grades.items()])
+    # update() sends no signals
+    forgetSubmissionDetails(grades)
+    return Code.OK
+
+
+def regradeAssignment(assignment, grade):
+    """Sets the grade of one review assignment and returns the grade it replaced."""
+    with transaction.atomic():
+        before = models.ReviewAssignment.objects.select_for_update().filter(id=assignment.id) \
+            .values_list('grade', flat=True).first()
+        assignment.grade = grade
+        assignment.save(update_fields=['grade'])
+        models.GradeAggregate.record([(assignment.submission_id, before, grade)])
+    return before
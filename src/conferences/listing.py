@@ -0,0 +1,53 @@
+import datetime
+
+from . import models
+
+PAGE_SIZE = 25
+
+UPCOMING = 'upcoming'
+OPEN = 'open'
+EVALUATED = 'evaluated'
+STATUS_CHOICES = (
+    ('', 'Any status'),
+    (UPCOMING, 'Upcoming'),
+    (OPEN, 'Open for proposals'),
+    (EVALUATED, 'Evaluated'),
+)
+
+
+class ConferencePage(object):
+    def __init__(self, conferences, nextCursor):
+        self.conferences = conferences
+        self.nextCursor = nextCursor
+
+
+def filterConferences(conferences, status=None, starts_after=None, starts_before=None, today=None):
+    today = today or datetime.date.today()
+
+    if status == UPCOMING:
+        conferences = conferences.filter(start_date__gt=today)
+    elif status == OPEN:
+        conferences = conferences.filter(abstract_date__gt=today, evaluated=False)
+    elif status == EVALUATED:
+        conferences = conferences.filter(evaluated=True)
+
+    if starts_after is not None:
+        conferences = conferences.filter(start_date__gte=starts_after)
+    if starts_before is not None:
+        conferences = conferences.filter(start_date__lte=starts_before)
+
+    return conferences
+
+
+def conferencePage(filters, after=None, pageSize=PAGE_SIZE):
+    # keyset pagination on the primary key: the cost of a page does not depend on how deep it is
+    conferences = filterConferences(models.Conference.objects.all(),
+                                    status=filters.get('status'),
+                                    starts_after=filters.get('starts_after'),
+                                    starts_before=filters.get('starts_before'))
+    if after is not None:
+        conferences = conferences.filter(id__gt=after)
+
+    rows = list(conferences.order_by('id')[:pageSize + 1])
+    nextCursor = rows[pageSize - 1].id if len(rows) > pageSize else None
+    return ConferencePage(rows[:pageSize], nextCursor)
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from conferences import models
+from conferences.uploads import submissionStorage
+
+
+class Command(BaseCommand):
+    help = ("Deletes stored abstracts and full papers that no submission refers to anymore. "
+            "Replaced and deleted submissions leave their files behind, so run it periodically.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--grace", type=int, default=60,
+                            help="Leave files younger than this many minutes alone, they may be mid-upload.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        referenced = set()
+        for abstract, full_paper in models.Submission.objects.values_list('abstract', 'full_paper').iterator():
+            referenced.update([abstract, full_paper])
+
+        cutoff = time.time() - options["grace"] * 60
+        removed = 0
+        for directory in ('abstracts', 'full-papers'):
+            for name in submissionStorage.blobs(directory):
+                if name in referenced or submissionStorage.get_modified_time(name).timestamp() > cutoff:
+                    continue
+                if not options["dry_run"]:
+                    submissionStorage.delete(name)
+                removed += 1
+
+        self.stdout.write("Removed " + str(removed) + " orphaned files.")
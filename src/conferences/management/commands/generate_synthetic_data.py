@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from conferences.synthetic import SyntheticDataset
+
+
+class Command(BaseCommand):
+    help = "Fills the database with synthetic users, conferences, submissions, bids, reviews and attendees."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--conferences", type=int, default=10)
+        parser.add_argument("--members", type=int, default=20, help="PC members per conference, besides the chair.")
+        parser.add_argument("--papers", type=int, default=100, help="Submissions per conference.")
+        parser.add_argument("--sections", type=int, default=5, help="Sections per conference.")
+        parser.add_argument("--reviewers", type=int, default=3, help="Reviewers per paper, once bidding is over.")
+        parser.add_argument("--attendees", type=int, default=5, help="Participants per paper.")
+        parser.add_argument("--password", default="synthetic", help="Password of every generated user.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        if options["members"] + 1 > options["users"] or options["attendees"] > options["users"]:
+            raise CommandError("Not enough users for that many PC members or attendees.")
+
+        started = time.time()
+        dataset = SyntheticDataset(
+            users=options["users"], conferences=options["conferences"], members=options["members"],
+            papers=options["papers"], sections=options["sections"], reviewers=options["reviewers"],
+            attendees=options["attendees"], password=options["password"], batchSize=options["batch_size"],
+            seed=options["seed"], log=self.stdout.write,
+        )
+        counts = dataset.generate()
+        self.stdout.write(self.style.SUCCESS("Inserted {} rows in {:.1f}s.".format(
+            sum(counts.values()), time.time() - started)))
@@ -0,0 +1,53 @@
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def _duplicates(model, fields):
+    groups = model.objects.values(*fields).order_by().annotate(keep=Min('id'), copies=Count('id')) \
+        .filter(copies__gt=1)
+    for group in groups:
+        copies = model.objects.filter(**{field: group[field] for field in fields}).exclude(id=group['keep'])
+        yield group['keep'], copies
+
+
+def merge_duplicates(apps, schema_editor):
+    Section = apps.get_model('conferences', 'Section')
+    Conference = apps.get_model('conferences', 'Conference')
+    Submission = apps.get_model('conferences', 'Submission')
+    PcMemberIn = apps.get_model('conferences', 'PcMemberIn')
+    Bidding = apps.get_model('conferences', 'Bidding')
+    ReviewAssignment = apps.get_model('conferences', 'ReviewAssignment')
+    SubmissionRemark = apps.get_model('conferences', 'SubmissionRemark')
+
+    for keep, copies in _duplicates(Section, ['name']):
+        section = Section.objects.get(id=keep)
+        for copy in copies:
+            Submission.objects.filter(chosen_section_id=copy.id).update(chosen_section_id=keep)
+            for conference in Conference.objects.filter(sections=copy):
+                conference.sections.remove(copy)
+                conference.sections.add(section)
+            if section.session_chair_id is None and copy.session_chair_id is not None:
+                section.session_chair_id = copy.session_chair_id
+                section.save()
+            copy.delete()
+
+    for keep, copies in _duplicates(PcMemberIn, ['conference_id', 'actor_id']):
+        ids = list(copies.values_list('id', flat=True))
+        for model in (Bidding, ReviewAssignment, SubmissionRemark):
+            model.objects.filter(pcmember_id__in=ids).update(pcmember_id=keep)
+        copies.delete()
+
+    for model in (Bidding, ReviewAssignment):
+        for keep, copies in _duplicates(model, ['submission_id', 'pcmember_id']):
+            copies.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conferences', '0009_auto_20190607_0857'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+    ]
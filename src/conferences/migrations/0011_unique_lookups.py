@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conferences', '0010_merge_duplicates'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='section',
+            name='name',
+            field=models.CharField(max_length=128, unique=True),
+        ),
+        migrations.AlterUniqueTogether(
+            name='bidding',
+            unique_together={('submission', 'pcmember')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='pcmemberin',
+            unique_together={('conference', 'actor')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='reviewassignment',
+            unique_together={('pcmember', 'submission')},
+        ),
+    ]
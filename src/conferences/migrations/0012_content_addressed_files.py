@@ -0,0 +1,22 @@
+import conferences.uploads
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conferences', '0011_unique_lookups'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='submission',
+            name='abstract',
+            field=models.FileField(storage=conferences.uploads.ContentAddressedStorage(), upload_to='abstracts'),
+        ),
+        migrations.AlterField(
+            model_name='submission',
+            name='full_paper',
+            field=models.FileField(null=True, storage=conferences.uploads.ContentAddressedStorage(), upload_to='full-papers'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def merge_duplicate_participants(apps, schema_editor):
+    Participants = apps.get_model('conferences', 'Participants')
+
+    groups = Participants.objects.values('paper_id', 'actor_id').order_by() \
+        .annotate(keep=Min('id'), copies=Count('id')).filter(copies__gt=1)
+    for group in groups:
+        Participants.objects.filter(paper_id=group['paper_id'], actor_id=group['actor_id']) \
+            .exclude(id=group['keep']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conferences', '0012_content_addressed_files'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_participants, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='participants',
+            unique_together={('paper', 'actor')},
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations, models
+from django.db.models import Count, F, Max, Min, Q, Sum
+import django.db.models.deletion
+
+
+def backfill_grade_aggregates(apps, schema_editor):
+    Submission = apps.get_model('conferences', 'Submission')
+    ReviewAssignment = apps.get_model('conferences', 'ReviewAssignment')
+    GradeAggregate = apps.get_model('conferences', 'GradeAggregate')
+
+    graded = ~Q(grade=0)
+    rows = ReviewAssignment.objects.values('submission_id').order_by() \
+        .annotate(reviews=Count('id'), graded=Count('id', filter=graded), total=Sum('grade'),
+                  squares=Sum(F('grade') * F('grade')), lowest=Min('grade', filter=graded),
+                  highest=Max('grade', filter=graded))
+    totals = {row.pop('submission_id'): row for row in rows}
+
+    GradeAggregate.objects.bulk_create([
+        GradeAggregate(submission_id=submissionId, **totals.get(submissionId, {}))
+        for submissionId in Submission.objects.values_list('id', flat=True)
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conferences', '0013_unique_participants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeAggregate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reviews', models.PositiveIntegerField(default=0)),
+                ('graded', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('squares', models.PositiveIntegerField(default=0)),
+                ('lowest', models.PositiveSmallIntegerField(null=True)),
+                ('highest', models.PositiveSmallIntegerField(null=True)),
+                ('submission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='conferences.Submission')),
+            ],
+        ),
+        migrations.RunPython(backfill_grade_aggregates, migrations.RunPython.noop),
+    ]
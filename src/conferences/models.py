@@ -1,12 +1,21 @@
-import re
-
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Max, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Least
 from django.contrib.auth import get_user_model
 
 # This is so that we create a new actor each time a user is saved.
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
+from .cache import (SECTION_TIMEOUT, bumpConferenceVersion, bumpSectionVersion, conferenceSectionsKey,
+                    forgetCapabilities, forgetConferenceSections, forgetSubmissionDetails,
+                    sectionIndexKey)
+from .choices import Labels
+from .codes import Code
+from .uploads import submissionStorage
+from .validation import validateConference
+
 User = get_user_model()
 
 
@@ -14,9 +23,17 @@ class Actor(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
 
     def isConferenceChair(self, conferenceId):
-        if self.conference_set.filter(id=conferenceId).first() is None:
-            return "notConferenceChair"
-        return "Ok"
+        chairs = self.__dict__.get('_chairs', {})
+        if conferenceId in chairs:
+            isChair = chairs[conferenceId]
+        else:
+            isChair = self.conference_set.filter(id=conferenceId).exists()
+        if not isChair:
+            return Code.NOT_CONFERENCE_CHAIR
+        return Code.OK
+
+    def rememberChair(self, conferenceId, isChair):
+        self.__dict__.setdefault('_chairs', {})[conferenceId] = isChair
 
 
 @receiver(post_save, sender=User)
@@ -25,25 +42,49 @@ def _post_save_user_handler(sender, **kwargs):
 
 
 class Section(models.Model):
-    name = models.CharField(max_length=128)
+    name = models.CharField(max_length=128, unique=True)
     session_chair = models.ForeignKey(Actor, on_delete=models.CASCADE, null=True)
 
+    @staticmethod
+    def add(sectionName):
+        try:
+            with transaction.atomic():
+                Section.objects.create(name=sectionName)
+        except IntegrityError:
+            return Code.ALREADY_EXISTS
+        return Code.OK
+
+    @staticmethod
+    def index():
+        # name -> Section of every section, in creation order; read through the cache
+        key = sectionIndexKey()
+        sections = cache.get(key)
+        if sections is None:
+            sections = {section.name: section for section in Section.objects.order_by('id')}
+            cache.set(key, sections, SECTION_TIMEOUT)
+        return sections
+
+    @staticmethod
+    def byName(sectionName):
+        return Section.index().get(sectionName)
+
     @staticmethod
     def alreadyExists(sectionName):
-        if Section.objects.filter(name=sectionName).exists():
-            return "alreadyExists"
-        return "Ok"
+        if sectionName in Section.index():
+            return Code.ALREADY_EXISTS
+        return Code.OK
 
     @staticmethod
     def exists(sectionName):
-        if Section.objects.filter(name=sectionName).exists():
-            return "Ok"
-        return "doesNotExist"
+        if sectionName in Section.index():
+            return Code.OK
+        return Code.DOES_NOT_EXIST
 
-    def getSection(sections, name):
-        for section in sections:
-            if section.name == name:
-                return section
+
+@receiver(post_save, sender=Section)
+@receiver(post_delete, sender=Section)
+def _section_changed_handler(sender, **kwargs):
+    bumpSectionVersion()
 
 
 class Conference(models.Model):
@@ -63,58 +104,45 @@ class Conference(models.Model):
 
     sections = models.ManyToManyField(Section, null=True)
 
+    def sectionNames(self):
+        key = conferenceSectionsKey(self.id)
+        names = cache.get(key)
+        if names is None:
+            names = set(self.sections.values_list('name', flat=True))
+            cache.set(key, names, SECTION_TIMEOUT)
+        return names
+
     def hasSection(self, section):
-        if self.sections.filter(name=section):
-            return "alreadyExists"
-        return "Ok"
+        if section in self.sectionNames():
+            return Code.ALREADY_EXISTS
+        return Code.OK
 
     def isNewDateAfterCurrent(self, data):
         if self is None:
-            return "doesNotExist"
+            return Code.DOES_NOT_EXIST
 
         if self.abstract_date >= data['abstract_date']:
-            return "dateBefore"
+            return Code.DATE_BEFORE
 
         if self.submission_date >= data['submission_date']:
-            return "dateBefore"
+            return Code.DATE_BEFORE
 
         if self.presentation_date >= data['presentation_date']:
-            return "dateBefore"
+            return Code.DATE_BEFORE
 
         if self.end_date >= data['end_date']:
-            return "dateBefore"
+            return Code.DATE_BEFORE
 
-        return "Ok"
+        return Code.OK
 
     def checkProposalSubmit(self):
         if self is None:
-            return "doesNotExist"
-
-        if self.end_date < self.start_date:
-            return "checkDates"
+            return Code.DOES_NOT_EXIST
 
-        if self.submission_date < self.abstract_date:
-            return "checkDates"
-
-        if self.bidding_date < self.submission_date \
-                or self.bidding_date > self.presentation_date:
-            return "checkDates"
-
-        if self.presentation_date > self.end_date:
-            return "checkDates"
-
-        regex = re.compile(
-            r'^(?:http|ftp)s?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # domain...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-
-        if re.match(regex, self.website) is None:
-            return "websiteNotOk"
-
-        return "Ok"
+        problems = validateConference(self.__dict__)
+        if problems:
+            return problems[0].code
+        return Code.OK
 
     def updateDates(self, data):
         self.abstract_date = data['abstract_date']
@@ -126,25 +154,31 @@ class Conference(models.Model):
 
     def actorIsPCMember(self, actor):
         if self is None:
-            return "doesNotExist"
-        if self.pcmemberin_set.filter(actor_id=actor.id).first() is None:
-            return "notPCMember"
-        return "Ok"
+            return Code.DOES_NOT_EXIST
+        if self.getPCMemberIn(actor) is None:
+            return Code.NOT_PC_MEMBER
+        return Code.OK
 
     def getPCMemberIn(self, actor):
-        return self.pcmemberin_set.filter(actor_id=actor.id).first()
+        members = self.__dict__.setdefault('_pcmembers', {})
+        if actor.id not in members:
+            members[actor.id] = self.pcmemberin_set.filter(actor_id=actor.id).first()
+        return members[actor.id]
+
+    def rememberPCMemberIn(self, actor, pcmember):
+        self.__dict__.setdefault('_pcmembers', {})[actor.id] = pcmember
 
     def isChairedBy(self, actor):
         if self is None:
-            return "doesNotExist"
-        if self.chairedBy.id != actor.id:
-            return "notConferenceChair"
-        return "Ok"
+            return Code.DOES_NOT_EXIST
+        if self.chairedBy_id != actor.id:
+            return Code.NOT_CONFERENCE_CHAIR
+        return Code.OK
 
     def isEvaluated(self):
         if self.evaluated:
-            return "alreadyEvaluated"
-        return "Ok"
+            return Code.ALREADY_EVALUATED
+        return Code.OK
 
 
 # this is to automatically add the chair as a pc member
@@ -156,10 +190,30 @@ def _post_save_conference_handler(sender, **kwargs):
         PcMemberIn(description="Created the conference.", conference=conf, actor=conf.chairedBy).save()
 
 
+# cached conference listings are keyed on this version
+@receiver(post_save, sender=Conference)
+@receiver(post_delete, sender=Conference)
+def _conference_changed_handler(sender, **kwargs):
+    bumpConferenceVersion()
+
+
+@receiver(m2m_changed, sender=Conference.sections.through)
+def _conference_sections_changed_handler(sender, action, reverse, instance, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        forgetConferenceSections([instance.id])
+    elif pk_set:
+        forgetConferenceSections(pk_set)
+    else:
+        # a section cleared of all its conferences does not say which ones they were
+        bumpSectionVersion()
+
+
 class Submission(models.Model):
     title = models.CharField(max_length=128)
-    abstract = models.FileField(upload_to='abstracts')
-    full_paper = models.FileField(upload_to='full-papers', null=True)
+    abstract = models.FileField(upload_to='abstracts', storage=submissionStorage)
+    full_paper = models.FileField(upload_to='full-papers', null=True, storage=submissionStorage)
     meta_info = models.CharField(max_length=10000, null=True)
     submitter = models.ForeignKey(Actor, on_delete=models.CASCADE)
     conference = models.ForeignKey(Conference, on_delete=models.CASCADE)
@@ -169,26 +223,27 @@ class Submission(models.Model):
 
     def actorIsSubmissionAuthor(self, actor):
         if self is None:
-            return "doesNotExist"
-        if self.submitter.id == actor.id:
-            return "actorIsSubmissionAuthor"
-        return "Ok"
+            return Code.DOES_NOT_EXIST
+        if self.submitter_id == actor.id:
+            return Code.ACTOR_IS_SUBMISSION_AUTHOR
+        return Code.OK
 
     def actorIsNotChair(self, actor):
         if self is None:
-            return "doesNotExist"
-        if self.conference.chairedBy.id != actor.id:
-            return "actorIsNotConferenceChair"
-        return "Ok"
+            return Code.DOES_NOT_EXIST
+        if self.conference.chairedBy_id != actor.id:
+            return Code.ACTOR_IS_NOT_CONFERENCE_CHAIR
+        return Code.OK
 
     def isChairOfConference(self, member):
         if self is None:
-            return "doesNotExist"
-        if self.conference.chairedBy.id == member.actor.id:
-            return "chairOfConference"
-        return "Ok"
+            return Code.DOES_NOT_EXIST
+        if self.conference.chairedBy_id == member.actor_id:
+            return Code.CHAIR_OF_CONFERENCE
+        return Code.OK
 
     def updateInfo(self, data):
+        # the replaced files may be shared by content; cleanup_uploads deletes them once nothing refers to them
         self.title = data['title']
         self.abstract = data['abstract']
         self.full_paper = data['full_paper']
@@ -197,28 +252,54 @@ class Submission(models.Model):
 
     def hasSection(self):
         if self.chosen_section is not None:
-            return "hasSection"
-        return "Ok"
+            return Code.HAS_SECTION
+        return Code.OK
 
     @staticmethod
     def allSubmissionsGraded(submissions, result):
-        for submission in submissions:
-            for review in submission.reviewassignment_set.all():
-                if review.grade == result:
-                    return "notAllGraded"
-        return "Ok"
+        if ReviewAssignment.objects.filter(submission__in=submissions, grade=result).exists():
+            return Code.NOT_ALL_GRADED
+        return Code.OK
+
+
+# the cached home page capabilities depend on who is an author, a PC member or an attendee where
+@receiver(post_save, sender=Submission)
+@receiver(post_delete, sender=Submission)
+def _submission_changed_handler(sender, **kwargs):
+    submission = kwargs['instance']
+    forgetCapabilities(submission.submitter_id, submission.conference_id)
 
 
 class Participants(models.Model):
     paper = models.ForeignKey(Submission, on_delete=models.CASCADE)
     actor = models.ForeignKey(Actor, on_delete=models.CASCADE)
 
+    class Meta:
+        unique_together = (('paper', 'actor'),)
+
     @staticmethod
-    def alreadyRegistered(participants, actor):
-        for x in participants:
-            if x.actor == actor:
-                return "alreadyRegistered"
-        return "Ok"
+    def register(paper, actor):
+        # insert or ignore: the unique index decides, so there is nothing to look up first
+        try:
+            with transaction.atomic():
+                Participants.objects.create(paper=paper, actor=actor)
+        except IntegrityError:
+            return Code.ALREADY_REGISTERED
+        return Code.OK
+
+
+@receiver(post_save, sender=Participants)
+@receiver(post_delete, sender=Participants)
+def _participants_changed_handler(sender, **kwargs):
+    participant = kwargs['instance']
+    # register() hands the submission in; only a participant loaded on its own needs the lookup
+    if Participants._meta.get_field('paper').is_cached(participant):
+        conferenceId = participant.paper.conference_id
+    else:
+        conferenceId = Submission.objects.filter(id=participant.paper_id) \
+            .values_list('conference_id', flat=True).first()
+    if conferenceId is not None:
+        forgetCapabilities(participant.actor_id, conferenceId)
 
 
 class BiddingValues:
@@ -231,6 +312,7 @@ class BiddingValues:
         (1, 'Neutral'),
         (2, 'Refuse to Evaluate'),
     )
+    LABELS = Labels(CHOICES)
 
 
 class GradingValues:
@@ -253,6 +335,7 @@ class GradingValues:
         (6, 'Reject'),
         (7, 'Strong Reject'),
     )
+    LABELS = Labels(CHOICES)
 
 
 class PcMemberIn(models.Model):
@@ -260,51 +343,47 @@ class PcMemberIn(models.Model):
     actor = models.ForeignKey(Actor, on_delete=models.CASCADE)
     conference = models.ForeignKey(Conference, on_delete=models.CASCADE)
 
-    def biddingValueFor(self, submission_id):
-        bid = self.bidding_set.filter(id=submission_id).first()
-
-        if bid is None:
-            return BiddingValues.N
+    class Meta:
+        unique_together = (('conference', 'actor'),)
 
-        return bid.getBid()
+    @staticmethod
+    def enroll(conference, actor, description):
+        # the unique (conference, actor) index decides, so two concurrent enrollments cannot both succeed
+        try:
+            with transaction.atomic():
+                PcMemberIn.objects.create(description=description, conference=conference, actor=actor)
+        except IntegrityError:
+            return Code.ALREADY_PC_MEMBER
+        return Code.OK
 
     def isMemberOfConference(self, conference):
         if self is None:
-            return "doesNotExist"
-        if self.conference != conference:
-            return "notMemberOfConference"
-        return "Ok"
+            return Code.DOES_NOT_EXIST
+        if self.conference_id != conference.id:
+            return Code.NOT_MEMBER_OF_CONFERENCE
+        return Code.OK
 
     def alreadyAssigned(self, pcMemberId, submissionId):
         if self is None:
-            return "doesNotExist"
+            return Code.DOES_NOT_EXIST
         if self.reviewassignment_set.filter(pcmember_id=pcMemberId).filter(
                 submission_id=submissionId).first() is not None:
-            return "alreadyAssigned"
-        return "Ok"
+            return Code.ALREADY_ASSIGNED
+        return Code.OK
 
     def isChair(self):
         if self is None:
-            return "doesNotExist"
-        if self.conference.chairedBy.id == self.actor.id:
-            return "chairOfConference"
-        return "Ok"
+            return Code.DOES_NOT_EXIST
+        if self.conference.chairedBy_id == self.actor_id:
+            return Code.CHAIR_OF_CONFERENCE
+        return Code.OK
 
-    @staticmethod
-    def userExists(pcmembers, name):
-        ok = 0
-        for x in pcmembers:
-            if x.actor.user.name == name:
-                ok = 1
-        if ok == 1:
-            return "Ok"
-        return "userDoesNotExist"
 
-    @staticmethod
-    def getUser(users, name):
-        for user in users:
-            if user.actor.user.name == name:
-                return user
+@receiver(post_save, sender=PcMemberIn)
+@receiver(post_delete, sender=PcMemberIn)
+def _pcmember_changed_handler(sender, **kwargs):
+    member = kwargs['instance']
+    forgetCapabilities(member.actor_id, member.conference_id)
 
 
 class Bidding(models.Model):
@@ -312,17 +391,17 @@ class Bidding(models.Model):
     pcmember = models.ForeignKey(PcMemberIn, on_delete=models.CASCADE)
     bid = models.PositiveSmallIntegerField(default=1, choices=BiddingValues.CHOICES)
 
-    def getBid(self):
-        for x in BiddingValues.CHOICES:
-            if self.bid == x[0]:
-                return x[1]
+    class Meta:
+        unique_together = (('submission', 'pcmember'),)
 
     @staticmethod
-    def getBidByMember(submission, member, biddings):
-        res = list(filter(lambda bid: bid.submission == submission and bid.pcmember == member, biddings))
-        if res:
-            return res[0].getBid()
-        return BiddingValues.N
+    def place(submission, pcmember, bid):
+        try:
+            with transaction.atomic():
+                Bidding.objects.create(submission=submission, pcmember=pcmember, bid=bid)
+        except IntegrityError:
+            return Code.ALREADY_BID
+        return Code.OK
 
 
 class SubmissionRemark(models.Model):
@@ -336,23 +415,145 @@ class ReviewAssignment(models.Model):
     pcmember = models.ForeignKey(PcMemberIn, on_delete=models.CASCADE)
     grade = models.PositiveSmallIntegerField(default=1, choices=GradingValues.CHOICES)
 
-    def getGrade(self):
-        for x in GradingValues.CHOICES:
-            if self.grade == x[0]:
-                return x[1]
+    class Meta:
+        unique_together = (('pcmember', 'submission'),)
+
+    @staticmethod
+    def assign(submission, pcmember):
+        try:
+            with transaction.atomic():
+                ReviewAssignment.objects.create(submission=submission, pcmember=pcmember,
+                                                grade=GradingValues.DEFAULT)
+        except IntegrityError:
+            return Code.ALREADY_ASSIGNED
+        return Code.OK
+
+
+class GradeAggregate(models.Model):
+    """Running totals of the grades of one submission, so its consensus is known while reviews arrive.
+
+    ``reviews`` counts the review assignments, ``graded`` those with a grade;
+    ``total``, ``squares``, ``lowest`` and ``highest`` only cover the graded ones.
+    """
+
+    submission = models.OneToOneField(Submission, on_delete=models.CASCADE)
+    reviews = models.PositiveIntegerField(default=0)
+    graded = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    squares = models.PositiveIntegerField(default=0)
+    lowest = models.PositiveSmallIntegerField(null=True)
+    highest = models.PositiveSmallIntegerField(null=True)
+
+    @property
+    def complete(self):
+        return self.reviews > 0 and self.graded == self.reviews
+
+    @property
+    def mean(self):
+        if not self.graded:
+            return None
+        return self.total / self.graded
+
+    @property
+    def variance(self):
+        if not self.graded:
+            return None
+        mean = self.mean
+        # rounding can push an exact zero slightly below it
+        return max(self.squares / self.graded - mean * mean, 0.0)
+
+    @property
+    def spread(self):
+        if not self.graded:
+            return None
+        return self.highest - self.lowest
+
+    @staticmethod
+    def record(changes):
+        """Folds (submission id, grade before, grade after) changes into the aggregates.
+
+        ``None`` before means the assignment was just created and ``None`` after
+        that it was deleted; GradingValues.DEFAULT means not graded. Counts and
+        sums move with F-expressions. The extremes follow an added grade the same
+        way, but are read again from the graded assignments when one is taken away.
+        Call it after the assignments themselves were written.
+        """
+        deltas = {}
+        for submissionId, before, after in changes:
+            delta = deltas.setdefault(submissionId, {'reviews': 0, 'graded': 0, 'total': 0, 'squares': 0,
+                                                     'added': [], 'removed': False})
+            delta['reviews'] += (before is None) - (after is None)
+            if before:
+                delta['graded'] -= 1
+                delta['total'] -= before
+                delta['squares'] -= before * before
+                delta['removed'] = True
+            if after:
+                delta['graded'] += 1
+                delta['total'] += after
+                delta['squares'] += after * after
+                delta['added'].append(after)
+
+        for submissionId, delta in deltas.items():
+            fields = {name: F(name) + delta[name] for name in ('reviews', 'graded', 'total', 'squares')
+                      if delta[name]}
+            if delta['removed']:
+                graded = ReviewAssignment.objects.filter(submission_id=OuterRef('submission_id')) \
+                    .exclude(grade=GradingValues.DEFAULT).order_by().values('submission_id')
+                fields['lowest'] = Subquery(graded.annotate(value=Min('grade')).values('value'))
+                fields['highest'] = Subquery(graded.annotate(value=Max('grade')).values('value'))
+            elif delta['added']:
+                lowest, highest = Value(min(delta['added'])), Value(max(delta['added']))
+                fields['lowest'] = Coalesce(Least('lowest', lowest), lowest)
+                fields['highest'] = Coalesce(Greatest('highest', highest), highest)
+            if fields:
+                GradeAggregate.objects.filter(submission_id=submissionId).update(**fields)
+
+
+@receiver(post_save, sender=Submission)
+def _post_save_submission_aggregate_handler(sender, **kwargs):
+    if kwargs['created']:
+        GradeAggregate.objects.create(submission=kwargs['instance'])
+
+
+# regrades go through grading.regradeAssignment, which knows the grade it replaces
+@receiver(post_save, sender=ReviewAssignment)
+def _post_save_review_assignment_handler(sender, **kwargs):
+    if kwargs['created']:
+        assignment = kwargs['instance']
+        GradeAggregate.record([(assignment.submission_id, None, assignment.grade)])
+
+
+@receiver(post_delete, sender=ReviewAssignment)
+def _post_delete_review_assignment_handler(sender, **kwargs):
+    assignment = kwargs['instance']
+    GradeAggregate.record([(assignment.submission_id, assignment.grade, None)])
 
 
 class EvaluationResult(models.Model):
     grade = models.PositiveSmallIntegerField(default=1, choices=GradingValues.CHOICES)
     submission = models.OneToOneField(Submission, on_delete=models.CASCADE)
 
-    def getGrade(self):
-        for x in GradingValues.CHOICES:
-            if self.grade == x[0]:
-                return x[1]
+
+# the submission detail page shows every bid, remark and grade of the submission
+@receiver(post_save, sender=Bidding)
+@receiver(post_delete, sender=Bidding)
+@receiver(post_save, sender=SubmissionRemark)
+@receiver(post_delete, sender=SubmissionRemark)
+@receiver(post_save, sender=ReviewAssignment)
+@receiver(post_delete, sender=ReviewAssignment)
+def _submission_detail_changed_handler(sender, **kwargs):
+    forgetSubmissionDetails([kwargs['instance'].submission_id])
 
 
 ################################################################################
 
 def loggedActor(view):
-    return Actor.objects.get(pk=view.request.user.id)
+    return actorOf(view.request)
+
+
+def actorOf(request):
+    # memoized on the request, so every view and check shares the same instance
+    if not hasattr(request, '_actor'):
+        request._actor = Actor.objects.get(user_id=request.user.id)
+    return request._actor
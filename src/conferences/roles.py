@@ -0,0 +1,111 @@
+from django.db.models import OuterRef, Subquery
+
+from . import models
+from .codes import Code
+
+
+class Roles(object):
+    """What the logged actor is with respect to one conference (and maybe one of its submissions)."""
+
+    def __init__(self, actor, conference, pcmember=None, submission=None):
+        self.actor = actor
+        self.conference = conference
+        self.pcmember = pcmember
+        self.submission = submission
+
+    @property
+    def isChair(self):
+        return self.conference is not None and self.conference.chairedBy_id == self.actor.id
+
+    @property
+    def isPCMember(self):
+        return self.pcmember is not None
+
+    @property
+    def isAuthor(self):
+        return self.submission is not None and self.submission.submitter_id == self.actor.id
+
+    def chairCheck(self):
+        if self.conference is None:
+            return Code.DOES_NOT_EXIST
+        return self.conference.isChairedBy(self.actor)
+
+    def memberCheck(self):
+        if self.conference is None:
+            return Code.DOES_NOT_EXIST
+        return self.conference.actorIsPCMember(self.actor)
+
+
+def _rolesCache(request):
+    if not hasattr(request, '_roles'):
+        request._roles = {}
+    return request._roles
+
+
+def _annotations(request, conferenceRef):
+    # the actor and its PC membership ride along the conference/submission row as subqueries,
+    # so resolving everything costs a single round trip
+    members = models.PcMemberIn.objects.filter(conference_id=OuterRef(conferenceRef),
+                                               actor__user_id=request.user.id)
+    return {
+        'logged_actor_id': Subquery(models.Actor.objects.filter(user_id=request.user.id).values('id')[:1]),
+        'logged_pcmember_id': Subquery(members.values('id')[:1]),
+        'logged_pcmember_description': Subquery(members.values('description')[:1]),
+    }
+
+
+def _resolve(request, conference, row, submission=None):
+    if row is None:
+        actor = models.actorOf(request)
+        return Roles(actor, None, submission=submission)
+
+    actor = getattr(request, '_actor', None)
+    if actor is None:
+        if row.logged_actor_id is None:
+            raise models.Actor.DoesNotExist
+        actor = request._actor = models.Actor(id=row.logged_actor_id, user_id=request.user.id)
+
+    pcmember = None
+    if row.logged_pcmember_id is not None:
+        pcmember = models.PcMemberIn(id=row.logged_pcmember_id, description=row.logged_pcmember_description,
+                                     actor=actor, conference=conference)
+
+    # let the model checks answer from what we already know
+    conference.rememberPCMemberIn(actor, pcmember)
+    actor.rememberChair(conference.id, conference.chairedBy_id == actor.id)
+
+    roles = Roles(actor, conference, pcmember, submission)
+    _rolesCache(request)[('conference', conference.id)] = roles
+    return roles
+
+
+def conferenceRoles(request, conferenceId):
+    cache = _rolesCache(request)
+    key = ('conference', conferenceId)
+    if key not in cache:
+        conference = models.Conference.objects.annotate(**_annotations(request, 'pk')) \
+            .filter(id=conferenceId).first()
+        cache[key] = _resolve(request, conference, conference)
+    return cache[key]
+
+
+def submissionRoles(request, submissionId):
+    cache = _rolesCache(request)
+    key = ('submission', submissionId)
+    if key not in cache:
+        submission = models.Submission.objects.select_related('conference') \
+            .annotate(**_annotations(request, 'conference_id')) \
+            .filter(id=submissionId).first()
+        conference = submission.conference if submission is not None else None
+        cache[key] = _resolve(request, conference, submission, submission)
+    return cache[key]
+
+
+class RolesMixin(object):
+    """Gives views the logged actor's roles, resolved once per request."""
+
+    def conferenceRoles(self):
+        return conferenceRoles(self.request, self.kwargs['conference_id'])
+
+    def submissionRoles(self):
+        return submissionRoles(self.request, self.kwargs['submission_id'])
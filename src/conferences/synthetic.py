@@ -0,0 +1,230 @@
+import datetime
+import itertools
+import random
+from collections import OrderedDict
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from profiles.models import Profile
+
+from . import models
+from .cache import bumpConferenceVersion, bumpSectionVersion
+from .evaluation import rebuildGradeAggregates
+from .uploads import submissionStorage
+
+User = get_user_model()
+
+# chance of each bid: want to evaluate, neutral, refuse
+BID_WEIGHTS = (0.3, 0.5, 0.2)
+
+
+class IdBlock(object):
+    """Primary keys past the current maximum, handed out before the rows exist.
+
+    bulk_create does not give ids back on every backend, so the generator picks
+    them itself and rows can point at each other before anything is inserted.
+    """
+
+    def __init__(self, model):
+        self.next = (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+    def take(self, count):
+        first = self.next
+        self.next += count
+        return range(first, self.next)
+
+
+def insert(model, rows, batchSize):
+    # rows may be a generator: only one batch of instances is ever held in memory
+    rows = iter(rows)
+    total = 0
+    while True:
+        batch = list(itertools.islice(rows, batchSize))
+        if not batch:
+            return total
+        # Django splits each batch again into what the backend accepts (SQLite caps the row count)
+        model.objects.bulk_create(batch)
+        total += len(batch)
+
+
+class ConferencePlan(object):
+    def __init__(self, id, people):
+        self.id = id
+        self.chair = people[0]
+        self.people = people
+        self.members = []  # (pcmember id, actor id), the chair's membership first
+        self.sections = []
+        self.papers = []  # (submission id, author actor id)
+        self.reviewed = False
+
+
+class SyntheticDataset(object):
+    """Fills the database with made-up users and conferences, table by table.
+
+    Everything the model signals would do per row (actors and profiles for new
+    users, the chair's PC membership and the listing cache version for new
+    conferences, the section index version for new sections) is done here in
+    bulk instead.
+    """
+
+    def __init__(self, users=1000, conferences=10, members=20, papers=100, sections=5, reviewers=3,
+                 attendees=5, password="synthetic", batchSize=5000, seed=None, log=None):
+        self.users = users
+        self.conferences = conferences
+        self.members = members
+        self.papers = papers
+        self.sections = sections
+        self.reviewers = reviewers
+        self.attendees = attendees
+        self.password = password
+        self.batchSize = batchSize
+        self.random = random.Random(seed)
+        self.log = log or (lambda message: None)
+        self.counts = OrderedDict()
+
+    def generate(self):
+        with transaction.atomic():
+            actors = self.createUsers()
+            plans = self.createConferences(actors)
+            self.createSubmissions(plans, actors)
+            self.count(models.Bidding, self.biddings(plans))
+            self.count(models.ReviewAssignment, self.reviewAssignments(plans))
+            rebuildGradeAggregates(models.Submission.objects.filter(conference_id__in=[plan.id for plan in plans]))
+            self.count(models.Participants, self.participants(plans, actors))
+            self.resetSequences()
+        bumpConferenceVersion()
+        bumpSectionVersion()
+        return self.counts
+
+    def count(self, model, rows):
+        inserted = insert(model, rows, self.batchSize)
+        self.counts[model._meta.verbose_name_plural] = inserted
+        self.log("{} {}".format(inserted, model._meta.verbose_name_plural))
+        return inserted
+
+    def createUsers(self):
+        userIds = IdBlock(User).take(self.users)
+        actorIds = IdBlock(models.Actor).take(self.users)
+        # hashing is deliberately slow, so every synthetic user shares one hash
+        password = make_password(self.password)
+
+        self.count(User, (User(id=id, email="synthetic-{}@example.com".format(id),
+                               name="Synthetic User {}".format(id), password=password)
+                          for id in userIds))
+        self.count(models.Actor, (models.Actor(id=actorId, user_id=userId)
+                                  for userId, actorId in zip(userIds, actorIds)))
+        self.count(Profile, (Profile(user_id=id) for id in userIds))
+        return list(actorIds)
+
+    def createConferences(self, actors):
+        today = datetime.date.today()
+        plans = []
+        conferences = []
+        for id in IdBlock(models.Conference).take(self.conferences):
+            plan = ConferencePlan(id, self.random.sample(actors, self.members + 1))
+            plans.append(plan)
+
+            # a date chain checkProposalSubmit accepts, anywhere from a year ago to a year ahead
+            start = today + datetime.timedelta(days=self.random.randint(-365, 365))
+            dates = [start]
+            for low, high in ((5, 30), (5, 30), (3, 14), (7, 30), (1, 5)):
+                dates.append(dates[-1] + datetime.timedelta(days=self.random.randint(low, high)))
+            plan.reviewed = dates[3] < today
+            conferences.append(models.Conference(
+                id=id, name="Synthetic Conference {}".format(id),
+                website="https://conference-{}.example.com".format(id),
+                info="Generated conference number {}.".format(id),
+                start_date=dates[0], abstract_date=dates[1], submission_date=dates[2],
+                bidding_date=dates[3], presentation_date=dates[4], end_date=dates[5],
+                chairedBy_id=plan.chair,
+            ))
+        self.count(models.Conference, conferences)
+
+        memberIds = IdBlock(models.PcMemberIn)
+        for plan in plans:
+            plan.members = list(zip(memberIds.take(len(plan.people)), plan.people))
+        self.count(models.PcMemberIn, (
+            models.PcMemberIn(id=memberId, actor_id=actorId, conference_id=plan.id,
+                              description="Created the conference." if actorId == plan.chair
+                              else "Synthetic PC member.")
+            for plan in plans for memberId, actorId in plan.members
+        ))
+
+        sectionIds = IdBlock(models.Section)
+        for plan in plans:
+            plan.sections = list(sectionIds.take(self.sections))
+        self.count(models.Section, (
+            models.Section(id=sectionId, name="Conference {} section {}".format(plan.id, k),
+                           session_chair_id=plan.members[k % len(plan.members)][1])
+            for plan in plans for k, sectionId in enumerate(plan.sections)
+        ))
+        through = models.Conference.sections.through
+        self.count(through, (through(conference_id=plan.id, section_id=sectionId)
+                             for plan in plans for sectionId in plan.sections))
+        return plans
+
+    def dummyFiles(self):
+        # content-addressed storage keeps a single copy however many papers point at it
+        abstract = submissionStorage.save("abstracts/synthetic.pdf",
+                                          ContentFile(b"%PDF-1.4\n% synthetic abstract\n%%EOF\n"))
+        paper = submissionStorage.save("full-papers/synthetic.pdf",
+                                       ContentFile(b"%PDF-1.4\n% synthetic full paper\n%%EOF\n"))
+        return abstract, paper
+
+    def createSubmissions(self, plans, actors):
+        abstract, paper = self.dummyFiles()
+        submissionIds = IdBlock(models.Submission)
+        for plan in plans:
+            plan.papers = [(id, self.random.choice(actors)) for id in submissionIds.take(self.papers)]
+
+        def submissions():
+            for plan in plans:
+                for id, author in plan.papers:
+                    section = self.random.choice(plan.sections) if plan.sections and plan.reviewed else None
+                    yield models.Submission(
+                        id=id, title="Synthetic paper {}".format(id), abstract=abstract, full_paper=paper,
+                        meta_info="Keywords: synthetic, generated", submitter_id=author,
+                        conference_id=plan.id, chosen_section_id=section,
+                    )
+        self.count(models.Submission, submissions())
+
+    def reviewersOf(self, plan):
+        return plan.members[1:]
+
+    def biddings(self, plans):
+        choices = [value for value, label in models.BiddingValues.CHOICES]
+        for plan in plans:
+            for submission, author in plan.papers:
+                for memberId, actorId in self.reviewersOf(plan):
+                    if actorId != author:
+                        yield models.Bidding(submission_id=submission, pcmember_id=memberId,
+                                             bid=self.random.choices(choices, BID_WEIGHTS)[0])
+
+    def reviewAssignments(self, plans):
+        for plan in plans:
+            if not plan.reviewed:
+                continue
+            for submission, author in plan.papers:
+                candidates = [memberId for memberId, actorId in self.reviewersOf(plan) if actorId != author]
+                for memberId in self.random.sample(candidates, min(self.reviewers, len(candidates))):
+                    yield models.ReviewAssignment(submission_id=submission, pcmember_id=memberId,
+                                                  grade=self.random.randint(0, 7))
+
+    def participants(self, plans, actors):
+        for plan in plans:
+            for submission, author in plan.papers:
+                for actorId in self.random.sample(actors, min(self.attendees, len(actors))):
+                    yield models.Participants(paper_id=submission, actor_id=actorId)
+
+    def resetSequences(self):
+        # rows were inserted with explicit ids, so point the sequences past them
+        tables = [User, models.Actor, models.Conference, models.PcMemberIn, models.Section,
+                  models.Submission]
+        with connection.cursor() as cursor:
+            for statement in connection.ops.sequence_reset_sql(no_style(), tables):
+                cursor.execute(statement)
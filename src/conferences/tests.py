@@ -0,0 +1,576 @@
+from __future__ import unicode_literals
+import datetime
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.messages import ERROR, get_messages
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import models
+from .assignment import autoAssignReviewers, solveAssignment
+from .codes import Code
+from .downloads import contentDisposition
+from .evaluation import closeEvaluation, rebuildGradeAggregates
+from .grading import regradeAssignment
+from .uploads import ContentAddressedStorage
+from .urls import urlpatterns
+from .validation import Problem, validateConference, validateConferences
+
+User = get_user_model()
+
+# Size of the smaller synthetic conference; the larger one is twice as big.
+# Raise it (CONFERENCES_BENCH_SCALE=10 python manage.py test conferences) to benchmark bigger data,
+# and set CONFERENCES_BENCH_REPORT=1 to print the time and memory table.
+SCALE = int(os.environ.get("CONFERENCES_BENCH_SCALE", "1"))
+MEDIA_ROOT = tempfile.mkdtemp(prefix="conferences-bench-")
+# base.html thumbnails the default profile picture on every page
+shutil.copy(os.path.join(settings.MEDIA_ROOT, "default_profile.png"), MEDIA_ROOT)
+
+
+def makeUser(name):
+    return User.objects.create_user(name + "@example.com", "secret", name=name)
+
+
+class World(object):
+    """A whole conference filled through the real models, signals included."""
+
+    def __init__(self, tag, papers, members):
+        today = datetime.date.today()
+        self.chair = makeUser(tag + "-chair")
+        self.conference = models.Conference.objects.create(
+            name=tag, website="http://" + tag + ".example.com", info="Synthetic " + tag,
+            start_date=today - datetime.timedelta(days=30),
+            abstract_date=today - datetime.timedelta(days=20),
+            submission_date=today - datetime.timedelta(days=15),
+            bidding_date=today - datetime.timedelta(days=10),
+            presentation_date=today + datetime.timedelta(days=10),
+            end_date=today + datetime.timedelta(days=20),
+            chairedBy=self.chair.actor,
+        )
+
+        self.members = []
+        for j in range(members):
+            user = makeUser(tag + "-member-" + str(j))
+            self.members.append(models.PcMemberIn.objects.create(
+                description="Member " + str(j), actor=user.actor, conference=self.conference))
+        self.reviewer = self.members[0].actor.user
+
+        self.submissions = []
+        for i in range(papers):
+            author = makeUser(tag + "-author-" + str(i))
+            self.submissions.append(models.Submission.objects.create(
+                title="Paper " + str(i),
+                abstract=SimpleUploadedFile("abstract.pdf", (tag + " abstract " + str(i)).encode()),
+                full_paper=SimpleUploadedFile("paper.pdf", (tag + " paper " + str(i)).encode()),
+                meta_info="About paper " + str(i),
+                submitter=author.actor,
+                conference=self.conference,
+            ))
+        self.paper = self.submissions[0]
+        self.author = self.paper.submitter.user
+
+        for i, submission in enumerate(self.submissions):
+            for j, member in enumerate(self.members):
+                models.Bidding.objects.create(submission=submission, pcmember=member,
+                                              bid=2 if (i * j) % 5 == 4 else (i + j) % 2)
+            # the first member reviews, grades and comments on everything
+            models.ReviewAssignment.objects.create(submission=submission, pcmember=self.members[0],
+                                                   grade=1 + i % 7)
+            models.SubmissionRemark.objects.create(submission=submission, pcmember=self.members[0],
+                                                   content="Remark on paper " + str(i))
+        for member in self.members[1:]:
+            models.SubmissionRemark.objects.create(submission=self.paper, pcmember=member, content="Me too")
+        # a member that is free to be assigned to the first paper
+        self.candidate = self.members[1]
+
+        self.section = models.Section.objects.create(name=tag + " section", session_chair=self.reviewer.actor)
+        self.conference.sections.add(self.section)
+        self.paper.chosen_section = self.section
+        self.paper.save()
+
+        for i in range(papers):
+            attendee = makeUser(tag + "-attendee-" + str(i))
+            models.Participants.objects.create(paper=self.paper, actor=attendee.actor)
+        self.attendee = attendee
+
+
+class Route(object):
+    def __init__(self, user, kwargs=None, method="get", data=None, status=200, prepare=None):
+        self.user = user
+        self.kwargs = kwargs or (lambda w: {})
+        self.method = method
+        self.data = data or (lambda w: {})
+        self.status = status
+        self.prepare = prepare
+
+
+def conference(w):
+    return {"conference_id": w.conference.id}
+
+
+def paper(w):
+    return {"submission_id": w.paper.id}
+
+
+ROUTES = {
+    "conferences": Route("chair"),
+    "add-conference": Route("chair"),
+    "create-section": Route("chair"),
+    "session-chairs": Route("chair", conference),
+    "session-chair-assignment": Route("chair", conference),
+    "pc-member-search": Route("chair", conference),
+    "postpone-deadlines": Route("chair", conference),
+    "submit-proposal": Route("author", conference),
+    "enroll-pcmember": Route("attendee", conference),
+    "submissions": Route("chair", conference),
+    "user-submissions-panel": Route("chair", conference),
+    "specific-submission": Route("reviewer", paper),
+    "submission-file": Route("reviewer", lambda w: {"submission_id": w.paper.id, "field": "full-paper"}),
+    "update-submission": Route("author", paper),
+    "bid-submission": Route("reviewer", paper),
+    "comment-submission": Route("reviewer", paper),
+    "pc-members-panel": Route("chair", conference),
+    "assign-reviewer": Route("chair", lambda w: {"submission_id": w.paper.id, "pcmember_id": w.candidate.id},
+                             status=302),
+    "auto-assign-reviewers": Route("chair", conference),
+    "reviewer-board": Route("reviewer", conference),
+    "grade-submission": Route("reviewer", lambda w: {"submission_id": w.paper.id, "grade_index": 2}, status=302),
+    "grade-submissions": Route("reviewer", conference, method="post", status=302,
+                               data=lambda w: {"grade-" + str(s.id): 3 for s in w.submissions[:2]}),
+    "evaluation-result": Route("reviewer", conference, prepare=lambda w: closeEvaluation(
+        models.Conference.objects.get(id=w.conference.id))),
+    "grade-consensus": Route("chair", conference),
+    "evaluate": Route("chair", conference, status=302),
+    "conference-panel": Route("chair", conference),
+    "add-section-conference": Route("chair", conference),
+    "assign-section": Route("chair", conference),
+    "section-assignment": Route("chair", paper),
+    "submission-details": Route("attendee", paper),
+    "join-paper": Route("attendee", paper),
+}
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class QueryCountRegressionTest(TestCase):
+    """Every conferences page must cost the same number of queries whatever the size of the conference."""
+
+    results = []
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.small = World("small", papers=3 * SCALE, members=3 * SCALE)
+        cls.large = World("large", papers=6 * SCALE, members=6 * SCALE)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        if os.environ.get("CONFERENCES_BENCH_REPORT"):
+            sys.stderr.write("\n{:<26} {:>6} {:>8} {:>10} {:>12}\n".format(
+                "view", "size", "queries", "ms", "peak KiB"))
+            for name, size, queries, elapsed, peak in sorted(cls.results):
+                sys.stderr.write("{:<26} {:>6} {:>8} {:>10.1f} {:>12.1f}\n".format(
+                    name, size, queries, elapsed * 1000, peak / 1024))
+
+    def setUp(self):
+        cache.clear()
+
+    def measure(self, name, world):
+        route = ROUTES[name]
+        if route.prepare is not None:
+            route.prepare(world)
+        user = {"chair": world.chair, "reviewer": world.reviewer,
+                "author": world.author, "attendee": world.attendee}[route.user]
+        self.client.force_login(user)
+        url = reverse(name, kwargs=route.kwargs(world))
+
+        # the first page of a run creates thumbnail rows and fills caches; both runs start from the same state
+        self.client.get(reverse("conferences"))
+        cache.clear()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, route.method)(url, route.data(world))
+            if hasattr(response, "streaming_content"):
+                b"".join(response.streaming_content)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        self.assertEqual(response.status_code, route.status, name)
+        errors = [str(m) for m in get_messages(response.wsgi_request) if m.level == ERROR]
+        self.assertEqual(errors, [], name)
+
+        size = len(world.submissions)
+        self.results.append((name, size, len(queries), elapsed, peak))
+        return len(queries)
+
+    def assertConstantQueries(self, name):
+        small = self.measure(name, self.small)
+        large = self.measure(name, self.large)
+        self.assertEqual(small, large, "{} runs {} queries for the small conference and {} for the large one"
+                         .format(name, small, large))
+
+    def test_every_route_is_benchmarked(self):
+        self.assertEqual(set(ROUTES), {pattern.name for pattern in urlpatterns})
+
+
+class SectionIndexTest(TestCase):
+    """The cached section index must follow every write to sections and to conference sections."""
+
+    def setUp(self):
+        cache.clear()
+        today = datetime.date.today()
+        chair = makeUser("index-chair")
+        self.conference = models.Conference.objects.create(
+            name="index", website="http://index.example.com", info="Section index",
+            start_date=today, abstract_date=today, submission_date=today, bidding_date=today,
+            presentation_date=today, end_date=today, chairedBy=chair.actor,
+        )
+        self.section = models.Section.objects.create(name="Databases")
+
+    def test_lookups_are_served_from_the_cache(self):
+        models.Section.index()
+        with self.assertNumQueries(0):
+            self.assertEqual(models.Section.byName("Databases"), self.section)
+            self.assertEqual(models.Section.exists("Databases"), Code.OK)
+            self.assertEqual(models.Section.alreadyExists("Networks"), Code.OK)
+
+    def test_section_writes_refresh_the_index(self):
+        models.Section.index()
+        networks = models.Section.objects.create(name="Networks")
+        self.assertEqual(models.Section.byName("Networks"), networks)
+
+        self.section.delete()
+        self.assertEqual(models.Section.exists("Databases"), Code.DOES_NOT_EXIST)
+
+    def test_conference_section_changes_refresh_the_names(self):
+        self.assertEqual(self.conference.hasSection("Databases"), Code.OK)
+        self.conference.sections.add(self.section)
+        self.assertEqual(self.conference.hasSection("Databases"), Code.ALREADY_EXISTS)
+
+        self.section.conference_set.remove(self.conference)
+        self.assertEqual(self.conference.hasSection("Databases"), Code.OK)
+
+        self.conference.sections.add(self.section)
+        self.section.conference_set.clear()
+        self.assertEqual(self.conference.hasSection("Databases"), Code.OK)
+
+
+class MediaTestCase(TestCase):
+    """Writes the uploads of its tests into a MEDIA_ROOT of its own."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.mediaRoot = tempfile.mkdtemp(prefix="conferences-test-")
+        cls.mediaSettings = override_settings(MEDIA_ROOT=cls.mediaRoot)
+        cls.mediaSettings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.mediaSettings.disable()
+        shutil.rmtree(cls.mediaRoot, ignore_errors=True)
+
+
+class SolveAssignmentTest(SimpleTestCase):
+    def solve(self, costs, demand, capacity):
+        return sorted(solveAssignment(len(costs), len(capacity), lambda i, j: costs[i][j], demand, capacity))
+
+    def test_cheapest_pairs_win(self):
+        self.assertEqual(self.solve([[0, 1], [1, 0]], [1, 1], [1, 1]), [(0, 0), (1, 1)])
+
+    def test_coverage_comes_before_cost(self):
+        # taking the cheap pair (0, 0) would leave the second paper without a reviewer
+        self.assertEqual(self.solve([[0, 1], [0, None]], [1, 1], [1, 1]), [(0, 1), (1, 0)])
+
+    def test_demand_and_capacity_bound_the_pairs(self):
+        pairs = self.solve([[0, 0], [0, 0], [0, 0]], [2, 2, 2], [2, 2])
+        self.assertEqual(len(pairs), 4)
+        for j in range(2):
+            self.assertEqual(len([pair for pair in pairs if pair[1] == j]), 2)
+        for i in range(3):
+            self.assertLessEqual(len([pair for pair in pairs if pair[0] == i]), 2)
+
+    def test_forbidden_pairs_are_never_picked(self):
+        self.assertEqual(self.solve([[None, None]], [1], [1, 1]), [])
+
+
+class AutoAssignReviewersTest(MediaTestCase):
+    def setUp(self):
+        self.world = World("assign", papers=4, members=4)
+        # a PC member who also submitted: nobody reviews their own paper
+        self.own = models.Submission.objects.create(
+            title="Own paper", abstract=SimpleUploadedFile("abstract.pdf", b"own abstract"),
+            meta_info="By a PC member", submitter=self.world.members[1].actor, conference=self.world.conference)
+
+    def test_assignments_follow_bids_demand_and_load(self):
+        conference = self.world.conference
+        before = models.ReviewAssignment.objects.count()
+
+        created = autoAssignReviewers(conference, reviewersPerPaper=2, maxLoad=3)
+
+        self.assertEqual(created, models.ReviewAssignment.objects.count() - before)
+        # the first member already reviews every World paper and is over the load; the others take 3 each at most
+        self.assertEqual(created, 6)
+        assignments = models.ReviewAssignment.objects.filter(submission__conference=conference) \
+            .select_related('submission', 'pcmember')
+        bids = dict(((bid.submission_id, bid.pcmember_id), bid.bid) for bid in models.Bidding.objects.all())
+        for assignment in assignments:
+            self.assertNotEqual(assignment.pcmember.actor_id, conference.chairedBy_id)
+            self.assertNotEqual(assignment.pcmember.actor_id, assignment.submission.submitter_id)
+            self.assertNotEqual(bids.get((assignment.submission_id, assignment.pcmember_id)), 2)
+        for member in self.world.members[1:]:
+            self.assertLessEqual(assignments.filter(pcmember=member).count(), 3)
+        for submission in self.world.submissions + [self.own]:
+            count = assignments.filter(submission=submission).count()
+            self.assertEqual(count, 2)
+            self.assertEqual(models.GradeAggregate.objects.get(submission=submission).reviews, count)
+
+    def test_nothing_is_left_to_assign_twice(self):
+        autoAssignReviewers(self.world.conference, reviewersPerPaper=2, maxLoad=3)
+        self.assertEqual(autoAssignReviewers(self.world.conference, reviewersPerPaper=2, maxLoad=3), 0)
+
+
+class GradeAggregateTest(MediaTestCase):
+    FIELDS = ('reviews', 'graded', 'total', 'squares', 'lowest', 'highest')
+
+    def setUp(self):
+        self.world = World("grades", papers=2, members=3)
+        self.paper = self.world.paper
+
+    def aggregate(self):
+        return models.GradeAggregate.objects.filter(submission=self.paper).values(*self.FIELDS).get()
+
+    def assertAggregate(self, **expected):
+        self.assertEqual(self.aggregate(), expected)
+
+    def test_assignments_move_the_aggregate(self):
+        # the World's first member graded the paper 1
+        self.assertAggregate(reviews=1, graded=1, total=1, squares=1, lowest=1, highest=1)
+
+        weak = models.ReviewAssignment.objects.create(submission=self.paper, pcmember=self.world.members[1], grade=5)
+        pending = models.ReviewAssignment.objects.create(submission=self.paper, pcmember=self.world.members[2],
+                                                         grade=models.GradingValues.DEFAULT)
+        self.assertAggregate(reviews=3, graded=2, total=6, squares=26, lowest=1, highest=5)
+
+        self.assertEqual(regradeAssignment(pending, 3), models.GradingValues.DEFAULT)
+        self.assertAggregate(reviews=3, graded=3, total=9, squares=35, lowest=1, highest=5)
+
+        # taking the highest grade away reads the extremes again
+        weak.delete()
+        self.assertAggregate(reviews=2, graded=2, total=4, squares=10, lowest=1, highest=3)
+
+    def test_record_folds_several_changes(self):
+        # written without signals, as the bulk paths do, then recorded together
+        models.ReviewAssignment.objects.filter(submission=self.paper).update(grade=2)
+        models.ReviewAssignment.objects.bulk_create([
+            models.ReviewAssignment(submission=self.paper, pcmember=self.world.members[1], grade=4),
+            models.ReviewAssignment(submission=self.paper, pcmember=self.world.members[2],
+                                    grade=models.GradingValues.DEFAULT),
+        ])
+        models.GradeAggregate.record([(self.paper.id, None, 4), (self.paper.id, None, models.GradingValues.DEFAULT),
+                                      (self.paper.id, 1, 2)])
+        self.assertAggregate(reviews=3, graded=2, total=6, squares=20, lowest=2, highest=4)
+
+    def test_rebuild_matches_the_running_totals(self):
+        models.ReviewAssignment.objects.create(submission=self.paper, pcmember=self.world.members[1], grade=6)
+        submissions = models.Submission.objects.filter(conference=self.world.conference)
+        running = {aggregate['submission_id']: aggregate for aggregate in
+                   models.GradeAggregate.objects.filter(submission__in=submissions)
+                   .values('submission_id', *self.FIELDS)}
+
+        models.GradeAggregate.objects.filter(submission__in=submissions).update(reviews=0, graded=0, total=0)
+        rebuildGradeAggregates(submissions)
+
+        rebuilt = {aggregate['submission_id']: aggregate for aggregate in
+                   models.GradeAggregate.objects.filter(submission__in=submissions)
+                   .values('submission_id', *self.FIELDS)}
+        self.assertEqual(rebuilt, running)
+
+
+class SubmissionDownloadTest(MediaTestCase):
+    def setUp(self):
+        cache.clear()
+        self.world = World("download", papers=1, members=2)
+        self.client.force_login(self.world.reviewer)
+        self.url = reverse("submission-file", kwargs={"submission_id": self.world.paper.id, "field": "full-paper"})
+        self.content = b"download paper 0"
+
+    def get(self, **headers):
+        response = self.client.get(self.url, **headers)
+        body = b"".join(response.streaming_content) if response.streaming else response.content
+        response.close()
+        return response, body
+
+    def test_whole_file(self):
+        response, body = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.content)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        # content-addressed files are tagged with their digest
+        self.assertEqual(response["ETag"], '"' + hashlib.sha256(self.content).hexdigest() + '"')
+
+    def test_range(self):
+        response, body = self.get(HTTP_RANGE="bytes=9-13")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, b"paper")
+        self.assertEqual(response["Content-Range"], "bytes 9-13/16")
+
+        response, body = self.get(HTTP_RANGE="bytes=-1")
+        self.assertEqual((response.status_code, body), (206, b"0"))
+
+    def test_range_past_the_end(self):
+        response, body = self.get(HTTP_RANGE="bytes=100-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */16")
+
+    def test_stale_if_range_sends_everything(self):
+        response, body = self.get(HTTP_RANGE="bytes=9-13", HTTP_IF_RANGE='"stale"')
+        self.assertEqual((response.status_code, body), (200, self.content))
+
+    def test_if_none_match(self):
+        etag = self.get()[0]["ETag"]
+        response, body = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, body), (304, b""))
+
+    def test_legacy_name_is_tagged_with_size_and_mtime(self):
+        os.makedirs(os.path.join(self.mediaRoot, "full-papers"), exist_ok=True)
+        path = os.path.join(self.mediaRoot, "full-papers", "legacy.pdf")
+        with open(path, "wb") as file:
+            file.write(self.content)
+        models.Submission.objects.filter(id=self.world.paper.id).update(full_paper="full-papers/legacy.pdf")
+        cache.clear()
+
+        response, body = self.get()
+        stat = os.stat(path)
+        self.assertEqual(body, self.content)
+        self.assertEqual(response["ETag"], '"{:x}-{:x}"'.format(stat.st_size, stat.st_mtime_ns))
+
+    def test_content_disposition(self):
+        self.assertEqual(contentDisposition("paper.pdf"), 'inline; filename="paper.pdf"')
+        self.assertEqual(contentDisposition('a "quoted"\\\r\nname.pdf'), 'inline; filename="a  quoted name.pdf"')
+        self.assertEqual(contentDisposition("Über.pdf"),
+                         "inline; filename=\"Uber.pdf\"; filename*=UTF-8''%C3%9Cber.pdf")
+        self.assertEqual(contentDisposition("\x00"), 'inline; filename="download"')
+
+
+class ContentAddressedStorageTest(SimpleTestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp(prefix="conferences-storage-")
+        self.addCleanup(shutil.rmtree, self.location, ignore_errors=True)
+        self.storage = ContentAddressedStorage(location=self.location)
+
+    def test_files_are_named_after_their_content(self):
+        digest = hashlib.sha256(b"same bytes").hexdigest()
+        name = self.storage.save("abstracts/First.PDF", ContentFile(b"same bytes"))
+        self.assertEqual(name, "abstracts/" + digest[:2] + "/" + digest + ".pdf")
+        with self.storage.open(name) as file:
+            self.assertEqual(file.read(), b"same bytes")
+
+    def test_the_same_content_is_stored_once(self):
+        first = self.storage.save("abstracts/a.pdf", ContentFile(b"same bytes"))
+        os.utime(self.storage.path(first), (0, 0))
+
+        second = self.storage.save("abstracts/b.pdf", ContentFile(b"same bytes"))
+        self.assertEqual(first, second)
+        self.assertEqual(list(self.storage.blobs("abstracts")), [first])
+        # the copy was touched, so cleanup_uploads leaves it alone for a while
+        self.assertGreater(os.stat(self.storage.path(first)).st_mtime, 0)
+
+        other = self.storage.save("abstracts/c.pdf", ContentFile(b"other bytes"))
+        self.assertNotEqual(other, first)
+
+
+class ValidationTest(TestCase):
+    def conference(self, **fields):
+        today = datetime.date.today()
+        data = dict(name="Valid", website="http://valid.example.com", start_date=today,
+                    abstract_date=today, submission_date=today + datetime.timedelta(days=1),
+                    bidding_date=today + datetime.timedelta(days=2),
+                    presentation_date=today + datetime.timedelta(days=3),
+                    end_date=today + datetime.timedelta(days=4))
+        data.update(fields)
+        return data
+
+    def test_a_valid_conference(self):
+        self.assertEqual(validateConference(self.conference()), [])
+
+    def test_the_first_broken_date_is_reported(self):
+        today = datetime.date.today()
+        self.assertEqual(validateConference(self.conference(start_date=None)),
+                         [Problem(Code.CHECK_DATES, 'start_date')])
+        self.assertEqual(validateConference(self.conference(submission_date=today - datetime.timedelta(days=1),
+                                                            bidding_date=today - datetime.timedelta(days=2))),
+                         [Problem(Code.CHECK_DATES, 'submission_date')])
+
+    def test_website(self):
+        self.assertEqual(validateConference(self.conference(website="not a website")),
+                         [Problem(Code.WEBSITE_NOT_OK, 'website')])
+
+    def test_names_and_websites_must_be_unique(self):
+        chair = makeUser("validation-chair")
+        models.Conference.objects.create(chairedBy=chair.actor, info="Taken", **self.conference(name="Taken"))
+
+        problems = validateConferences([
+            self.conference(name="Taken", website="http://first.example.com"),
+            self.conference(name="Second", website="http://second.example.com"),
+            self.conference(name="Third", website="http://second.example.com"),
+        ])
+        self.assertEqual(problems, [
+            [Problem(Code.NAME_TAKEN, 'name')],
+            [],
+            [Problem(Code.WEBSITE_TAKEN, 'website')],
+        ])
+
+
+class SyntheticDataTest(MediaTestCase):
+    def test_generate_synthetic_data(self):
+        # more users than SQLite takes in one INSERT, as the default batch size allows
+        out = StringIO()
+        call_command("generate_synthetic_data", users=300, conferences=2, members=5, papers=20, sections=2,
+                     reviewers=2, attendees=3, seed=1, stdout=out)
+
+        self.assertEqual(User.objects.count(), 300)
+        self.assertEqual(models.Actor.objects.count(), 300)
+        self.assertEqual(models.Conference.objects.count(), 2)
+        self.assertEqual(models.PcMemberIn.objects.count(), 2 * 6)
+        self.assertEqual(models.Section.objects.count(), 2 * 2)
+        self.assertEqual(models.Submission.objects.count(), 2 * 20)
+        self.assertEqual(models.Participants.objects.count(), 2 * 20 * 3)
+        for aggregate in models.GradeAggregate.objects.all():
+            self.assertEqual(aggregate.reviews, models.ReviewAssignment.objects.filter(
+                submission_id=aggregate.submission_id).count())
+        self.assertIn("Inserted", out.getvalue())
+
+        # the sequences were moved past the generated ids
+        chair = makeUser("after-synthetic")
+        self.assertEqual(User.objects.count(), 301)
+        models.Section.objects.create(name="After synthetic", session_chair=chair.actor)
+
+
+def _benchmark(name):
+    def test(self):
+        self.assertConstantQueries(name)
+    return test
+
+
+for _name in ROUTES:
+    setattr(QueryCountRegressionTest, "test_" + _name.replace("-", "_"), _benchmark(_name))
@@ -0,0 +1,90 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.utils.deconstruct import deconstructible
+
+
+class HashedUploadedFile(TemporaryUploadedFile):
+    sha256 = None
+
+
+class StreamingUploadHandler(FileUploadHandler):
+    """Streams every upload chunk by chunk to a temporary file, hashing it on the way.
+
+    Nothing is ever buffered in memory, and a file over UPLOAD_MAX_SIZE is
+    dropped as soon as it crosses the limit instead of after it is complete.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+        self.received = 0
+        self.file = HashedUploadedFile(self.file_name, self.content_type, 0, self.charset,
+                                       self.content_type_extra)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        limit = settings.UPLOAD_MAX_SIZE
+        if limit and self.received > limit:
+            self.file.close()
+            if self.request is not None:
+                messages.error(self.request, "The file " + self.file_name + " is larger than "
+                               + str(limit // (1024 * 1024)) + " MB!")
+            raise SkipFile()
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.sha256 = self.digest.hexdigest()
+        return self.file
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Keeps one copy of each distinct file, named after the SHA-256 of its content."""
+
+    def save(self, name, content, max_length=None):
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest = getattr(content, 'sha256', None) or self.digestOf(content)
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()[:10]
+        name = '/'.join(filter(None, [directory, digest[:2], digest + extension]))
+
+        # the same paper uploaded twice is stored once; touching the copy keeps it inside
+        # cleanup_uploads' grace period until the new submission refers to it
+        try:
+            os.utime(self.path(name))
+            return name
+        except FileNotFoundError:
+            return super().save(name, content, max_length)
+
+    @staticmethod
+    def digestOf(content):
+        digest = hashlib.sha256()
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        return digest.hexdigest()
+
+    def blobs(self, directory):
+        # every stored file under one upload_to directory, as storage names
+        if not self.exists(directory):
+            return
+        for bucket in self.listdir(directory)[0]:
+            for filename in self.listdir(directory + '/' + bucket)[1]:
+                yield directory + '/' + bucket + '/' + filename
+
+
+submissionStorage = ContentAddressedStorage()
@@ -0,0 +1,101 @@
+import re
+
+from django.db.models import Q
+
+from .codes import Code
+
+# compiled once, shared by every check
+WEBSITE_RE = re.compile(
+    r'^(?:http|ftp)s?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+# each deadline must not come before the one it follows; the later field takes the blame
+DATE_CHAIN = (
+    ('start_date', 'end_date'),
+    ('abstract_date', 'submission_date'),
+    ('submission_date', 'bidding_date'),
+    ('bidding_date', 'presentation_date'),
+    ('presentation_date', 'end_date'),
+)
+
+# how many names fit in one IN (...) without hitting SQLite's parameter limit
+LOOKUP_BATCH = 400
+
+
+class Problem(object):
+    """One reason a conference is not acceptable: an error code and the field it is about."""
+
+    def __init__(self, code, field=None):
+        self.code = code
+        self.field = field
+
+    def __eq__(self, other):
+        return isinstance(other, Problem) and (self.code, self.field) == (other.code, other.field)
+
+    def __repr__(self):
+        return "Problem({!r}, {!r})".format(self.code, self.field)
+
+
+def websiteProblem(website):
+    if not website or WEBSITE_RE.match(website) is None:
+        return Problem(Code.WEBSITE_NOT_OK, 'website')
+    return None
+
+
+def dateProblem(data):
+    for earlier, later in DATE_CHAIN:
+        if data.get(earlier) is None:
+            return Problem(Code.CHECK_DATES, earlier)
+        if data.get(later) is None or data[later] < data[earlier]:
+            return Problem(Code.CHECK_DATES, later)
+    return None
+
+
+def validateConference(data):
+    """Problems with the dates and the website of one conference, given as a mapping of its fields.
+
+    Only the first broken link of the date chain is reported, as the old checks did.
+    """
+    return [problem for problem in (dateProblem(data), websiteProblem(data.get('website'))) if problem]
+
+
+def takenNamesAndWebsites(rows):
+    # models validate themselves through this module, so import it late
+    from . import models
+
+    names = {row.get('name') for row in rows} - {None}
+    websites = {row.get('website') for row in rows} - {None}
+    takenNames, takenWebsites = set(), set()
+    names, websites = list(names), list(websites)
+    for start in range(0, max(len(names), len(websites)), LOOKUP_BATCH):
+        for name, website in models.Conference.objects.filter(
+                Q(name__in=names[start:start + LOOKUP_BATCH]) |
+                Q(website__in=websites[start:start + LOOKUP_BATCH])).values_list('name', 'website'):
+            takenNames.add(name)
+            takenWebsites.add(website)
+    return takenNames, takenWebsites
+
+
+def validateConferences(rows):
+    """Problems of each row of a batch of conferences, in the order of the rows.
+
+    Besides the per-row checks, names and websites must be unique: against the
+    existing conferences (one query per few hundred rows) and within the batch.
+    """
+    takenNames, takenWebsites = takenNamesAndWebsites(rows)
+    problems = []
+    for row in rows:
+        rowProblems = validateConference(row)
+        if row.get('name') in takenNames:
+            rowProblems.append(Problem(Code.NAME_TAKEN, 'name'))
+        if row.get('website') in takenWebsites:
+            rowProblems.append(Problem(Code.WEBSITE_TAKEN, 'website'))
+        # a later row reusing a name or website clashes with this one
+        takenNames.add(row.get('name'))
+        takenWebsites.add(row.get('website'))
+        problems.append(rowProblems)
+    return problems
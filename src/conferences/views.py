@@ -3,67 +3,38 @@ from braces import views as bracesviews
 from django import forms as django_forms
 from django.contrib import messages
 from django.shortcuts import render
+from django.db.models import F, Q
 from django.views import generic
 from django.views.generic import FormView
 from django.urls import reverse_lazy
-from django.http import HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect, JsonResponse
 import datetime
+import json
+import os
 
 from . import forms
 from . import models
+from .assignment import autoAssignReviewers
+from .bidding import BiddingMatrix
+from .downloads import serveFile
+from .cache import conferenceVersion
+from .capabilities import capabilityMap
+from .checks import Pipeline
+from .codes import Code, firstFailure, messageFor
+from .details import submissionDetail
+from .directory import conferenceMembers, memberNamed, searchMembers
+from .evaluation import closeEvaluation, gradeConsensus, percentage, reviewProgress
+from .grading import applyGrades, parseGrades, regradeAssignment
+from .listing import conferencePage
+from .roles import RolesMixin
+from .validation import validateConferences
 
 
 def reactToFormAction(evaluate, request):
-    if evaluate == "notConferenceChair":
-        messages.error(request, 'You are not the chair!')
-    elif evaluate == "dateBefore":
-        messages.error(request, 'You time-traveller...')
-    elif evaluate == "doesNotExist":
-        messages.error(request, 'This required item does not exist!')
-    elif evaluate == "checkDates":
-        messages.error(request, 'Make sure the conference ends after it starts and the abstract\'s '
-                                'deadline if before the full paper\'s deadline !')
-    elif evaluate == "websiteNotOk":
-        messages.error(request, 'Make sure your website is correct ( http://www.[].[]!')
-    elif evaluate == "alreadyBid":
-        messages.error(request, 'You already have done a bid to this submission!')
-    elif evaluate == "alreadyExists":
-        messages.error(request, 'Item is already added!')
-    elif evaluate == "actorIsNotConferenceChair":
-        messages.error(request, "The currently logged user is not the chair where the submission was made...")
-    elif evaluate == "actorIsSubmissionAuthor":
-        messages.error(request, "The actor is the submission's author.")
-    elif evaluate == "notMemberOfConference":
-        messages.error(request, "This is not a PC member of this conference.")
-    elif evaluate == "chairOfConference":
-        messages.error(request, "The member is the chair of the conference.")
-    elif evaluate == "alreadyAssigned":
-        messages.error(request, "The member has already been assigned to review this paper.")
-    elif evaluate == "refusedToEvaluate":
-        messages.error(request, "You should respect his decision of not voting this paper.")
-    elif evaluate == "notAssigned":
-        messages.error(request, "You have not been assigned to review this paper.")
-    elif evaluate == "chairOfConference":
-        messages.error(request, "The chair of the conference cannot do this.")
-    elif evaluate == "wrongMark":
-        messages.error(request, "You cannot assign this grade.")
-    elif evaluate == "alreadyEvaluated":
-        messages.error(request, "This conference has already been evaluated.")
-    elif evaluate == "notAllGraded":
-        messages.error(request, "Not all submissions have been evaluated!")
-    elif evaluate == "notPCMember":
-        messages.error(request, "You are not a PC member!")
-    elif evaluate == "hasSection":
-        messages.error(request, "This submission is already in a section!")
-    elif evaluate == "alreadyRegistered":
-        messages.error(request, "You already attend this paper!")
-    elif evaluate == "userDoesNotExist":
-        messages.error(request, "The user does not exist!")
-    else:
-        messages.error(request, 'Some error occured!')
-
-
-class Abstract(bracesviews.LoginRequiredMixin, generic.TemplateView):
+    messages.error(request, messageFor(evaluate))
+
+
+class Abstract(RolesMixin, bracesviews.LoginRequiredMixin, generic.TemplateView):
     pass
 
 
@@ -72,8 +43,25 @@ class HomePage(Abstract):
 
     def get_context_data(self, **kwargs):
         context = super(Abstract, self).get_context_data(**kwargs)
-        context['actor'] = models.loggedActor(self)
-        context['conferences'] = models.Conference.objects.all()
+        actor = models.loggedActor(self)
+        form = forms.ConferenceFilter(self.request.GET or None)
+        filters = form.cleaned_data if form.is_valid() else {}
+
+        after = self.request.GET.get('after', '')
+        page = conferencePage(filters, after=int(after) if after.isdigit() else None)
+        capabilities = capabilityMap(actor, page.conferences)
+        for conf in page.conferences:
+            conf.can = capabilities[conf.id]
+
+        context['actor'] = actor
+        context['form'] = form
+        context['conferences'] = page.conferences
+        context['version'] = conferenceVersion()
+
+        if page.nextCursor is not None:
+            params = self.request.GET.copy()
+            params['after'] = page.nextCursor
+            context['next_page'] = params.urlencode()
         return context
 
 
@@ -85,7 +73,13 @@ class AddConference(FormView, Abstract):
     def form_valid(self, form):
         data = form.cleaned_data
 
-        conference = models.Conference(
+        problems = validateConferences([data])[0]
+        if problems:
+            for problem in problems:
+                reactToFormAction(problem.code, self.request)
+            return self.render_to_response(self.get_context_data(form=form))
+
+        models.Conference(
             name=data['name'],
             website=data['website'],
             info=data['info'],
@@ -96,17 +90,9 @@ class AddConference(FormView, Abstract):
             presentation_date=data['presentation_date'],
             end_date=data['end_date'],
             chairedBy=models.loggedActor(self)
-        )
-
-        evaluate = conference.checkProposalSubmit()
-
-        if evaluate is "Ok":
-            conference.save()
-            messages.success(self.request, 'Conference added successfully!')
-            return HttpResponseRedirect(reverse_lazy("conferences"))
-        else:
-            reactToFormAction(evaluate, self.request)
-            return self.render_to_response(self.get_context_data(form=form))
+        ).save()
+        messages.success(self.request, 'Conference added successfully!')
+        return HttpResponseRedirect(reverse_lazy("conferences"))
 
 
 class PostponeDeadlines(FormView, Abstract):
@@ -116,21 +102,19 @@ class PostponeDeadlines(FormView, Abstract):
 
     def form_valid(self, form):
         data = form.cleaned_data
-        conf_id = self.kwargs['conference_id']
-        actor = models.loggedActor(self)
-        this_conference = models.Conference.objects.get(id=conf_id)
+        roles = self.conferenceRoles()
+        this_conference = roles.conference
 
-        evaluate = [actor.isConferenceChair(conf_id), this_conference.isNewDateAfterCurrent(data)]
+        evaluate = firstFailure(roles.chairCheck,
+                                lambda: this_conference.isNewDateAfterCurrent(data))
 
-        if evaluate.count("Ok") != len(evaluate):
-            for evaluation in evaluate:
-                if evaluation != "Ok":
-                    reactToFormAction(evaluation, self.request)
-                    return self.render_to_response(self.get_context_data(form=form))
-        else:
-            this_conference.updateDates(data)
-            messages.success(self.request, 'Deadlines postponed successfully!')
-            return super(PostponeDeadlines, self).form_valid(form)
+        if evaluate != Code.OK:
+            reactToFormAction(evaluate, self.request)
+            return self.render_to_response(self.get_context_data(form=form))
+
+        this_conference.updateDates(data)
+        messages.success(self.request, 'Deadlines postponed successfully!')
+        return super(PostponeDeadlines, self).form_valid(form)
 
 
 class SubmitProposal(FormView, Abstract):
@@ -140,10 +124,9 @@ class SubmitProposal(FormView, Abstract):
 
     def form_valid(self, form):
         data = form.cleaned_data
-        conf_id = self.kwargs['conference_id']
-        actor = models.loggedActor(self)
-        actors_conference = actor.conference_set.filter(id=conf_id).first()
-        this_conference = models.Conference.objects.filter(id=conf_id).first()
+        roles = self.conferenceRoles()
+        actor = roles.actor
+        this_conference = roles.conference
 
         correct = 0
         # if this conference does not exist.
@@ -151,11 +134,11 @@ class SubmitProposal(FormView, Abstract):
             correct = 1
 
         # if this user is chairing this conference... then they can't submit
-        if actors_conference is not None:
+        elif roles.isChair:
             correct = 2
 
         # Or if we're beyond the time for submitting abstracts...
-        if this_conference.abstract_date <= datetime.date.today():
+        elif this_conference.abstract_date <= datetime.date.today():
             correct = 3
 
         if correct == 0:
@@ -187,10 +170,7 @@ class CreateSection(FormView, Abstract):
     def form_valid(self, form):
         data = form.cleaned_data
 
-        if models.Section.alreadyExists(data['section_name']) == "Ok":
-            models.Section(
-                name=data['section_name']
-            ).save()
+        if models.Section.add(data['section_name']) == Code.OK:
             messages.success(self.request, 'You have successfully added this section!')
             return super(CreateSection, self).form_valid(form)
         else:
@@ -206,23 +186,22 @@ class AddSectionToConference(FormView, Abstract):
 
     def form_valid(self, form):
         data = form.cleaned_data
-        conf_id = self.kwargs['conference_id']
-        this_conference = models.Conference.objects.filter(id=conf_id).first()
+        roles = self.conferenceRoles()
+        this_conference = roles.conference
         section_name = data['section_name']
-        actor = models.loggedActor(self)
 
-        evaluate = [this_conference.isChairedBy(actor), models.Section.exists(section_name),
-                    this_conference.hasSection(section_name)]
+        # both section checks answer from the cached section index
+        evaluate = firstFailure(roles.chairCheck,
+                                lambda: models.Section.exists(section_name),
+                                lambda: this_conference.hasSection(section_name))
 
-        if evaluate.count("Ok") != len(evaluate):
-            for evaluation in evaluate:
-                if evaluation != "Ok":
-                    reactToFormAction(evaluation, self.request)
-                    return self.render_to_response(self.get_context_data(form=form))
-        else:
-            this_conference.sections.add(models.Section.objects.get(name=section_name))
-            messages.success(self.request, 'You have successfully added this tag to your conference!')
-            return super(AddSectionToConference, self).form_valid(form)
+        if evaluate != Code.OK:
+            reactToFormAction(evaluate, self.request)
+            return self.render_to_response(self.get_context_data(form=form))
+
+        this_conference.sections.add(models.Section.byName(section_name))
+        messages.success(self.request, 'You have successfully added this tag to your conference!')
+        return super(AddSectionToConference, self).form_valid(form)
 
 
 class EnrollPcMember(FormView, Abstract):
@@ -232,10 +211,9 @@ class EnrollPcMember(FormView, Abstract):
 
     def form_valid(self, form):
         data = form.cleaned_data
-        conf_id = self.kwargs['conference_id']
-        actor = models.loggedActor(self)
-        actors_conference = actor.conference_set.filter(id=conf_id).first()
-        this_conference = models.Conference.objects.filter(id=conf_id).first()
+        roles = self.conferenceRoles()
+        actor = roles.actor
+        this_conference = roles.conference
 
         correct = 0
         # if this conference does not exist...
@@ -243,19 +221,18 @@ class EnrollPcMember(FormView, Abstract):
             correct = 1
 
         # if this user is chairing this conference... then they can't submit
-        if actors_conference is not None:
+        elif roles.isChair:
             correct = 2
 
         # if this user is already a pc member in this conference... then he can't submit
-        elif this_conference.pcmemberin_set.filter(actor_id=actor.id).first() is not None:
+        elif roles.isPCMember:
+            correct = 3
+
+        # if someone enrolled this very user in the meantime...
+        if correct == 0 and models.PcMemberIn.enroll(this_conference, actor, data['description']) != Code.OK:
             correct = 3
 
         if correct == 0:
-            models.PcMemberIn(
-                description=data['description'],
-                actor=actor,
-                conference=this_conference
-            ).save()
             messages.success(self.request, 'You are successfully enrolled!')
             return super(EnrollPcMember, self).form_valid(form)
         elif correct == 2:
@@ -273,7 +250,8 @@ class Submissions(Abstract):
 
     def get_context_data(self, **kwargs):
         context = super(Abstract, self).get_context_data(**kwargs)
-        context['submissions'] = models.Submission.objects.filter(conference_id=self.kwargs['conference_id'])
+        context['submissions'] = models.Submission.objects.filter(conference_id=self.kwargs['conference_id']) \
+            .select_related('submitter__user')
         context['conf'] = models.Conference.objects.filter(id=self.kwargs['conference_id'])[0]
         context['today'] = datetime.date.today
         return context
@@ -295,11 +273,9 @@ class UpdateSubmission(FormView, Abstract):
 
     def form_valid(self, form):
         data = form.cleaned_data
-        submission_id = self.kwargs['submission_id']
-        actor = models.loggedActor(self)
-        this_submission = models.Submission.objects.get(id=submission_id)
-        this_conference = this_submission.conference
-        actors_conference = actor.conference_set.filter(id=this_conference.id).first()
+        roles = self.submissionRoles()
+        this_submission = roles.submission
+        this_conference = roles.conference
         valid_context = True
 
         # if this conference does not exist.
@@ -308,7 +284,7 @@ class UpdateSubmission(FormView, Abstract):
             valid_context = False
 
         # if this user is chairing this conference... then he can't update submission(proposal)
-        if actors_conference is not None:
+        elif roles.isChair:
             messages.error(self.request, 'You are the chair!')
             valid_context = False
 
@@ -326,20 +302,19 @@ class SpecificSubmission(Abstract):
     template_name = "conferences/specific-submission.html"
 
     def dispatch(self, request, *args, **kwargs):
-        submission = models.Submission.objects.filter(id=self.kwargs['submission_id']).first()
-        actor = models.loggedActor(self)
+        roles = self.submissionRoles()
 
         correct = 0
         # if submission doesn't exist...
-        if submission is None:
+        if roles.submission is None:
             correct = 1
 
         # if the actor isn't a pc member for this conference...
-        if actor.pcmemberin_set.filter(conference_id=submission.conference.id).first() is None:
+        elif not roles.isPCMember:
             correct = 2
 
         # if the actor is the author of this submission ( can happen if pc member submits proposal )
-        if submission.submitter.id == actor.id:
+        elif roles.isAuthor:
             correct = 3
 
         if correct == 0:
@@ -353,26 +328,40 @@ class SpecificSubmission(Abstract):
 
     def get_context_data(self, **kwargs):
         context = super(Abstract, self).get_context_data(**kwargs)
-        actor = models.loggedActor(self)
-        submission = models.Submission.objects.get(pk=self.kwargs['submission_id'])
-        biddings = list(submission.bidding_set.all())
-
-        for x in biddings:
-            x.bid = x.getBid()
-
-        grades = list(submission.reviewassignment_set.all())
-        for x in grades:
-            x.grade = x.getGrade()
+        roles = self.submissionRoles()
+        actor = roles.actor
+        submission = roles.submission
 
         context['submission'] = submission
-        context['biddings'] = biddings
-        context['remarks'] = list(submission.submissionremark_set.all())
-        context['grades'] = grades
+        context.update(submissionDetail(submission))
         context['actor'] = actor
 
         return context
 
 
+class SubmissionFile(Abstract):
+    fields = {'abstract': 'abstract', 'full-paper': 'full_paper'}
+
+    def get(self, request, *args, **kwargs):
+        roles = self.submissionRoles()
+        submission = roles.submission
+        field = self.fields.get(self.kwargs['field'])
+
+        if submission is None or field is None or not getattr(submission, field):
+            raise Http404
+
+        # the author and the PC members of the conference may read the paper
+        if submission.actorIsSubmissionAuthor(roles.actor) != Code.ACTOR_IS_SUBMISSION_AUTHOR:
+            evaluate = roles.conference.actorIsPCMember(roles.actor)
+            if evaluate != Code.OK:
+                reactToFormAction(evaluate, request)
+                return HttpResponseRedirect(reverse_lazy("conferences"))
+
+        stored = getattr(submission, field)
+        extension = os.path.splitext(stored.name)[1]
+        return serveFile(request, stored.storage, stored.name, submission.title + ' - ' + self.kwargs['field'] + extension)
+
+
 class BidSubmission(FormView, Abstract):
     template_name = "conferences/bid-submission.html"
     form_class = forms.BidSubmission
@@ -382,38 +371,22 @@ class BidSubmission(FormView, Abstract):
         data = form.cleaned_data
         submission_id = self.kwargs['submission_id']
 
-        actor = models.loggedActor(self)
-        this_submission = models.Submission.objects.filter(id=submission_id).first()
-
-        evaluate = []
-
-        this_conference = this_submission.conference
-        pcmemberin = this_conference.pcmemberin_set.filter(actor_id=actor.id).first()
-
-        # if this actor is not a pc member in this conference...
-        if pcmemberin is None:
-            evaluate.append("actorNotPCMember")
-
-        evaluate.append(this_submission.actorIsSubmissionAuthor(actor))
+        roles = self.submissionRoles()
+        actor = roles.actor
+        this_submission = roles.submission
 
-        # if this actor has already bid on this submission...
-        if models.Bidding.objects.filter(submission_id=this_submission.id).filter(
-                pcmember_id=pcmemberin.id).first() is not None:
-            evaluate.append("alreadyBid")
+        # if this actor has already bid on this submission, the unique (submission, pcmember) index refuses it
+        evaluate = Pipeline() \
+            .check(roles.memberCheck) \
+            .check(lambda: this_submission.actorIsSubmissionAuthor(actor)) \
+            .then(lambda: models.Bidding.place(this_submission, roles.pcmember, data['bidding'])) \
+            .run()
 
-        if evaluate.count("Ok") != len(evaluate):
-            for evaluation in evaluate:
-                if evaluation != "Ok":
-                    reactToFormAction(evaluation, self.request)
-                    return HttpResponseRedirect('/conferences/submissions/' + str(submission_id))
+        if evaluate != Code.OK:
+            reactToFormAction(evaluate, self.request)
         else:
-            models.Bidding(
-                submission=this_submission,
-                pcmember=this_conference.getPCMemberIn(actor),
-                bid=data['bidding']
-            ).save()
             messages.success(self.request, 'Bid made successfully!')
-            return HttpResponseRedirect('/conferences/submissions/' + str(submission_id))
+        return HttpResponseRedirect('/conferences/submissions/' + str(submission_id))
 
 
 class CommentSubmission(FormView, Abstract):
@@ -425,37 +398,36 @@ class CommentSubmission(FormView, Abstract):
         data = form.cleaned_data
         submission_id = self.kwargs['submission_id']
 
-        actor = models.loggedActor(self)
-        this_submission = models.Submission.objects.filter(id=submission_id).first()
-
-        this_conference = this_submission.conference
-        evaluate = [this_submission.actorIsSubmissionAuthor(actor), this_conference.actorIsPCMember(actor)]
+        roles = self.submissionRoles()
+        actor = roles.actor
+        this_submission = roles.submission
 
-        if evaluate.count("Ok") != len(evaluate):
-            for evaluation in evaluate:
-                if evaluation != "Ok":
-                    reactToFormAction(evaluation, self.request)
-                    return HttpResponseRedirect('/conferences/submissions/' + str(submission_id))
-        else:
+        def remark():
             models.SubmissionRemark(
                 submission=this_submission,
-                pcmember=this_conference.getPCMemberIn(actor),
+                pcmember=roles.pcmember,
                 content=data['remark']
             ).save()
-            return HttpResponseRedirect('/conferences/submissions/' + str(submission_id))
+            return Code.OK
+
+        evaluate = Pipeline() \
+            .check(roles.memberCheck) \
+            .check(lambda: this_submission.actorIsSubmissionAuthor(actor)) \
+            .then(remark) \
+            .run()
+
+        if evaluate != Code.OK:
+            reactToFormAction(evaluate, self.request)
+        return HttpResponseRedirect('/conferences/submissions/' + str(submission_id))
 
 
 class PcMembersPanel(Abstract):
     template_name = "conferences/pc-members-panel.html"
 
     def dispatch(self, request, *args, **kwargs):
-        actor = models.loggedActor(self)
-        conf_id = self.kwargs['conference_id']
-        this_conference = models.Conference.objects.filter(id=conf_id).first()
+        evaluate = self.conferenceRoles().chairCheck()
 
-        evaluate = this_conference.isChairedBy(actor)
-
-        if evaluate == "Ok":
+        if evaluate == Code.OK:
             return render(request, PcMembersPanel.template_name, self.get_context_data(**kwargs))
         else:
             reactToFormAction(evaluate, request)
@@ -464,66 +436,82 @@ class PcMembersPanel(Abstract):
     def get_context_data(self, **kwargs):
         context = super(Abstract, self).get_context_data(**kwargs)
 
-        actor = models.loggedActor(self)
-        conf_id = self.kwargs['conference_id']
-        this_conference = models.Conference.objects.filter(id=conf_id).first()
+        this_conference = self.conferenceRoles().conference
 
         context['conf'] = this_conference
         context['today'] = datetime.date.today()
 
-        submissions = this_conference.submission_set.all()
-        members = this_conference.pcmemberin_set.all()
+        matrix = BiddingMatrix(this_conference)
 
-        for member in members:
-            member.opinions = list(map(lambda x: {'id': x.id, 'value':
-                models.Bidding.getBidByMember(x, member, models.Bidding.objects.all())}, submissions))
+        for member in matrix.members:
+            member.opinions = matrix.opinions(member)
 
-        context['submissions'] = submissions
-        context['members'] = members
+        context['submissions'] = matrix.submissions
+        context['members'] = matrix.members
 
         return context
 
 
 class AssignPcMember(Abstract):
     def dispatch(self, request, *args, **kwargs):
-        actor = models.loggedActor(self)
-        _submission = models.Submission.objects.filter(id=self.kwargs['submission_id']).first()
-        _pcmember = models.PcMemberIn.objects.filter(id=self.kwargs['pcmember_id']).first()
-
-        evaluate = [_submission.actorIsSubmissionAuthor(actor),
-                    _submission.actorIsNotChair(actor),
-                    _submission.isChairOfConference(_pcmember),
-                    _pcmember.isMemberOfConference(_submission.conference),
-                    _pcmember.alreadyAssigned(_pcmember.id, _submission.id)]
-
-        value = models.Bidding.getBidByMember(_submission, _pcmember, models.Bidding.objects.all())
-        if value == models.BiddingValues.R:
-            evaluate.append("refusedToEvaluate")
-
-        if evaluate.count("Ok") != len(evaluate):
-            for evaluation in evaluate:
-                if evaluation != "Ok":
-                    reactToFormAction(evaluation, self.request)
-                    return HttpResponseRedirect('/conferences/' + str(_submission.conference.id) + '/pc-members')
+        roles = self.submissionRoles()
+        actor = roles.actor
+        _submission = roles.submission
+        if _submission is None:
+            raise Http404
+        conference = _submission.conference
+        pcmemberId = self.kwargs['pcmember_id']
+        members = models.PcMemberIn.objects.filter(id=pcmemberId)
+
+        # the member is only ever looked at in the database, all at once and after the chair checks;
+        # the unique (pcmember, submission) index rejects a second assignment
+        evaluate = Pipeline(models.Submission.objects.filter(id=_submission.id)) \
+            .check(lambda: _submission.actorIsSubmissionAuthor(actor)) \
+            .check(lambda: _submission.actorIsNotChair(actor)) \
+            .failUnless(members, Code.DOES_NOT_EXIST) \
+            .failIf(members.filter(actor_id=conference.chairedBy_id), Code.CHAIR_OF_CONFERENCE) \
+            .failUnless(members.filter(conference_id=conference.id), Code.NOT_MEMBER_OF_CONFERENCE) \
+            .failIf(models.Bidding.objects.filter(submission_id=_submission.id, pcmember_id=pcmemberId,
+                                                  bid=models.BiddingValues.LABELS.valueOf(models.BiddingValues.R)),
+                    Code.REFUSED_TO_EVALUATE) \
+            .then(lambda: models.ReviewAssignment.assign(_submission, models.PcMemberIn(id=pcmemberId))) \
+            .run()
+
+        if evaluate != Code.OK:
+            reactToFormAction(evaluate, self.request)
         else:
-            models.ReviewAssignment(
-                submission=_submission,
-                pcmember=_pcmember,
-                grade=models.GradingValues.DEFAULT
-            ).save()
             messages.success(self.request, 'Reviewer assigned successfully!')
-            return HttpResponseRedirect('/conferences/' + str(_submission.conference.id) + '/pc-members')
+        return HttpResponseRedirect('/conferences/' + str(conference.id) + '/pc-members')
+
+
+class AutoAssignReviewers(FormView, Abstract):
+    template_name = "conferences/auto-assign.html"
+    form_class = forms.AutoAssignReviewers
+
+    def form_valid(self, form):
+        data = form.cleaned_data
+        roles = self.conferenceRoles()
+        this_conference = roles.conference
+
+        evaluate = firstFailure(roles.chairCheck,
+                                lambda: Code.BIDDING_NOT_OVER if this_conference.bidding_date >= datetime.date.today()
+                                else Code.OK)
+
+        if evaluate != Code.OK:
+            reactToFormAction(evaluate, self.request)
+            return self.render_to_response(self.get_context_data(form=form))
+
+        assigned = autoAssignReviewers(this_conference, data['reviewers_per_paper'], data['max_load'])
+        messages.success(self.request, str(assigned) + ' reviewers assigned successfully!')
+        return HttpResponseRedirect('/conferences/' + str(this_conference.id) + '/pc-members')
 
 
 class ReviewerBoard(Abstract):
     template_name = "conferences/reviewer-board.html"
 
     def dispatch(self, request, *args, **kwargs):
-        actor = models.loggedActor(self)
-        conference = models.Conference.objects.filter(id=self.kwargs['conference_id']).first()
-
-        evaluate = conference.actorIsPCMember(actor)
-        if evaluate == "Ok":
+        evaluate = self.conferenceRoles().memberCheck()
+        if evaluate == Code.OK:
             return render(request, ReviewerBoard.template_name, self.get_context_data(**kwargs))
         else:
             reactToFormAction(evaluate, request)
@@ -532,15 +520,17 @@ class ReviewerBoard(Abstract):
     def get_context_data(self, **kwargs):
         context = super(Abstract, self).get_context_data(**kwargs)
 
-        actor = models.loggedActor(self)
-        conference = models.Conference.objects.filter(id=self.kwargs['conference_id']).first()
-        pcmemberin = actor.pcmemberin_set.filter(conference_id=conference.id).first()
-
-        assignments = pcmemberin.reviewassignment_set.all()
+        roles = self.conferenceRoles()
 
-        submissions = list(map(lambda x: x.submission, assignments))
+        assignments = list(roles.pcmember.reviewassignment_set.select_related('submission')
+                           .annotate(label=models.GradingValues.LABELS.annotation('grade')).order_by('submission_id'))
+        graded = sum(1 for assignment in assignments if assignment.grade != models.GradingValues.DEFAULT)
 
-        context['submissions'] = submissions
+        context['conf'] = roles.conference
+        context['assignments'] = assignments
+        context['graded'] = graded
+        context['completion'] = percentage(graded, len(assignments))
+        context['progress'] = reviewProgress(roles.conference)
         context['grades'] = models.GradingValues.CHOICES[1:]
 
         return context
@@ -548,90 +538,122 @@ class ReviewerBoard(Abstract):
 
 class GradeSubmission(Abstract):
     def dispatch(self, request, *args, **kwargs):
-        actor = models.loggedActor(self)
-        grades = models.GradingValues.CHOICES
+        roles = self.submissionRoles()
+        grades = models.GradingValues.LABELS
         grade_index = self.kwargs['grade_index']
 
-        evaluate = []
-        if grade_index < 1 or grade_index >= len(grades):
-            evaluate.append("wrongMark")
+        _submission = roles.submission
+        _pcmember = roles.pcmember
 
-        _submission = models.Submission.objects.filter(id=self.kwargs['submission_id']).first()
+        evaluate = firstFailure(lambda: Code.WRONG_MARK if grade_index < 1 or grade_index >= len(grades) else Code.OK,
+                                roles.memberCheck,
+                                lambda: _pcmember.isChair(),
+                                lambda: _submission.actorIsSubmissionAuthor(_pcmember.actor))
 
-        _pcmember = _submission.conference.pcmemberin_set.filter(actor_id=actor.id).first()
+        reviewAssignment = None
+        if evaluate == Code.OK:
+            reviewAssignment = _pcmember.reviewassignment_set.filter(submission_id=_submission.id).first()
+            if reviewAssignment is None:
+                evaluate = Code.NOT_ASSIGNED
+
+        if evaluate != Code.OK:
+            reactToFormAction(evaluate, self.request)
+        else:
+            before = regradeAssignment(reviewAssignment, grade_index)
+            if not before:
+                messages.success(self.request, 'Grade assigned successfully!')
+            else:
+                messages.success(self.request, 'You have successfully modified your grade from '
+                                 + grades[before] + ' to ' + grades[grade_index])
+        return HttpResponseRedirect('/conferences/' + str(_submission.conference.id) + '/reviewer-board')
 
-        evaluate.append(_pcmember.isChair())
-        evaluate.append(_submission.actorIsSubmissionAuthor(_pcmember.actor))
 
-        reviewAssignment = _pcmember.reviewassignment_set.filter(submission_id=_submission.id).first()
+class GradeSubmissions(Abstract):
+    http_method_names = ['post']
 
-        if reviewAssignment.grade == models.GradingValues.DEFAULT:
-            before = None
+    def post(self, request, *args, **kwargs):
+        roles = self.conferenceRoles()
+        asJson = request.content_type == 'application/json'
+
+        if asJson:
+            try:
+                pairs = [(x['submission'], x['grade']) for x in json.loads(request.body.decode('utf-8'))['grades']]
+            except (ValueError, KeyError, TypeError):
+                pairs = None
         else:
-            before = reviewAssignment.grade
+            pairs = [(key[len('grade-'):], value) for key, value in request.POST.items()
+                     if key.startswith('grade-') and value]
+
+        grades = parseGrades(pairs) if pairs is not None else None
+        evaluate = roles.memberCheck()
+        if evaluate == Code.OK:
+            evaluate = Code.WRONG_MARK if grades is None else applyGrades(roles.pcmember, grades)
 
-        if reviewAssignment is None:
-            evaluate.append("notAssigned")
+        if asJson:
+            return JsonResponse({'result': evaluate, 'graded': len(grades) if evaluate == Code.OK else 0},
+                                status=200 if evaluate == Code.OK else 400)
 
-        if evaluate.count("Ok") != len(evaluate):
-            for evaluation in evaluate:
-                if evaluation != "Ok":
-                    reactToFormAction(evaluation, self.request)
-                    return HttpResponseRedirect('/conferences/' + str(_submission.conference.id) + '/reviewer-board')
+        if evaluate == Code.OK:
+            messages.success(request, str(len(grades)) + ' grades saved successfully!')
         else:
-            reviewAssignment.grade = grade_index
-            reviewAssignment.save()
-            if before is None:
-                messages.success(self.request, 'Grade assigned successfully!')
-            else:
-                messages.success(self.request, 'You have successfully modified your grade from '
-                                 + models.GradingValues.CHOICES[before][1] + ' to '
-                                 + models.GradingValues.CHOICES[grade_index][1])
-        return HttpResponseRedirect('/conferences/' + str(_submission.conference.id) + '/reviewer-board')
+            reactToFormAction(evaluate, request)
+        return HttpResponseRedirect('/conferences/' + str(self.kwargs['conference_id']) + '/reviewer-board')
 
 
 class Evaluation(Abstract):
     def dispatch(self, request, *args, **kwargs):
-        actor = models.loggedActor(self)
-        conference = models.Conference.objects.filter(id=self.kwargs['conference_id']).first()
-        submissions = conference.submission_set.all()
+        roles = self.conferenceRoles()
+        conference = roles.conference
 
-        evaluate = [conference.isChairedBy(actor), conference.isEvaluated(),
-                    models.Submission.allSubmissionsGraded(submissions, models.GradingValues.DEFAULT)]
+        conferenceId = self.kwargs['conference_id']
+        aggregates = models.GradeAggregate.objects.filter(submission__conference_id=conferenceId)
 
-        if evaluate.count("Ok") != len(evaluate):
-            for evaluation in evaluate:
-                if evaluation != "Ok":
-                    reactToFormAction(evaluation, self.request)
-                    return HttpResponseRedirect(reverse_lazy("conferences"))
+        # a quick look for ungraded or unreviewed papers spares loading every aggregate when it is too early
+        evaluate = Pipeline(models.Conference.objects.filter(id=conferenceId)) \
+            .check(roles.chairCheck) \
+            .check(lambda: conference.isEvaluated()) \
+            .failIf(aggregates.filter(Q(reviews=0) | Q(graded__lt=F('reviews'))), Code.NOT_ALL_GRADED) \
+            .then(lambda: closeEvaluation(conference)) \
+            .run()
+
+        if evaluate != Code.OK:
+            reactToFormAction(evaluate, self.request)
         else:
-            for s in submissions:
-                grades = list(map(lambda x: x.grade, list(s.reviewassignment_set.all())))
-                finalGrade = sum(grades) / float(len(grades))
-                if int(finalGrade) <= models.GradingValues.CHOICES[4][0]:
-                    # i.e., borderline
-                    s.result = True
-                else:
-                    s.result = False
-                s.save()
-                models.EvaluationResult(submission=s, grade=finalGrade).save()
-            conference.evaluated = True
-            conference.save()
             messages.success(self.request, 'Evaluation period ended successfully!')
 
         return HttpResponseRedirect(reverse_lazy("conferences"))
 
 
+class GradeConsensus(Abstract):
+    template_name = "conferences/grade-consensus.html"
+
+    def dispatch(self, request, *args, **kwargs):
+        evaluate = self.conferenceRoles().chairCheck()
+        if evaluate == Code.OK:
+            return render(request, GradeConsensus.template_name, self.get_context_data(**kwargs))
+        else:
+            reactToFormAction(evaluate, request)
+            return HttpResponseRedirect(reverse_lazy("conferences"))
+
+    def get_context_data(self, **kwargs):
+        context = super(Abstract, self).get_context_data(**kwargs)
+        conference = self.conferenceRoles().conference
+
+        context['conf'] = conference
+        context['aggregates'] = gradeConsensus(conference)
+        context['progress'] = reviewProgress(conference)
+        context['grades'] = models.GradingValues.CHOICES[1:]
+
+        return context
+
+
 class EvaluationResult(Abstract):
     template_name = "conferences/evaluation-result.html"
 
     def dispatch(self, request, *args, **kwargs):
-        actor = models.loggedActor(self)
-        conference = models.Conference.objects.filter(id=self.kwargs['conference_id']).first()
-
-        evaluate = conference.actorIsPCMember(actor)
+        evaluate = self.conferenceRoles().memberCheck()
 
-        if evaluate == "Ok":
+        if evaluate == Code.OK:
             messages.success(self.request, 'Permission OK!')
             return render(request, EvaluationResult.template_name, self.get_context_data(**kwargs))
         else:
@@ -641,16 +663,16 @@ class EvaluationResult(Abstract):
 
     def get_context_data(self, **kwargs):
         context = super(Abstract, self).get_context_data(**kwargs)
-        conference = models.Conference.objects.filter(id=self.kwargs['conference_id']).first()
+        roles = self.conferenceRoles()
+        conference = roles.conference
 
         if conference.evaluated:
-            evaluations = list(map(lambda x: x.evaluationresult, conference.submission_set.all()))
-
-            for x in evaluations:
-                x.grade = x.getGrade()
+            evaluations = models.EvaluationResult.objects.filter(submission__conference_id=conference.id) \
+                .select_related('submission__submitter__user') \
+                .annotate(label=models.GradingValues.LABELS.annotation('grade'))
 
             context['evaluations'] = evaluations
-            if conference.isChairedBy(models.loggedActor(self)) == "Ok":
+            if roles.isChair:
                 context['chair'] = True
             context['conf'] = conference
         else:
@@ -664,13 +686,9 @@ class AssignSection(Abstract):
     template_name = "conferences/assign-section.html"
 
     def dispatch(self, request, *args, **kwargs):
-        actor = models.loggedActor(self)
-        conf_id = self.kwargs['conference_id']
-        this_conference = models.Conference.objects.filter(id=conf_id).first()
+        evaluate = self.conferenceRoles().chairCheck()
 
-        evaluate = this_conference.isChairedBy(actor)
-
-        if evaluate == "Ok":
+        if evaluate == Code.OK:
             return render(request, AssignSection.template_name, self.get_context_data(**kwargs))
         else:
             reactToFormAction(evaluate, request)
@@ -679,15 +697,14 @@ class AssignSection(Abstract):
     def get_context_data(self, **kwargs):
         context = super(Abstract, self).get_context_data(**kwargs)
 
-        conf_id = self.kwargs['conference_id']
-        this_conference = models.Conference.objects.filter(id=conf_id).first()
+        this_conference = self.conferenceRoles().conference
 
         context['conf'] = this_conference
 
-        submissions = this_conference.submission_set.all()
+        submissions = this_conference.submission_set.select_related('submitter__user', 'chosen_section')
 
         context['submissions'] = submissions
-        context['sections'] = models.Section.objects.all()
+        context['sections'] = models.Section.index().values()
 
         return context
 
@@ -701,18 +718,16 @@ class SectionAssignment(FormView, Abstract):
         data = form.cleaned_data
         submission = models.Submission.objects.filter(id=self.kwargs['submission_id']).first()
 
-        evaluate = [models.Section.exists(data['section_name']), submission.hasSection()]
+        evaluate = firstFailure(lambda: models.Section.exists(data['section_name']), submission.hasSection)
 
-        if evaluate.count("Ok") != len(evaluate):
-            for evaluation in evaluate:
-                if evaluation != "Ok":
-                    reactToFormAction(evaluation, self.request)
-                    return self.render_to_response(self.get_context_data(form=form))
-        else:
-            submission.chosen_section = models.Section.getSection(models.Section.objects.all(), data['section_name'])
-            submission.save()
-            messages.success(self.request, 'You have successfully assigned the section to this conference!')
-            return super(SectionAssignment, self).form_valid(form)
+        if evaluate != Code.OK:
+            reactToFormAction(evaluate, self.request)
+            return self.render_to_response(self.get_context_data(form=form))
+
+        submission.chosen_section = models.Section.byName(data['section_name'])
+        submission.save()
+        messages.success(self.request, 'You have successfully assigned the section to this conference!')
+        return super(SectionAssignment, self).form_valid(form)
 
 
 class ConferenceSubmissions(Abstract):
@@ -720,7 +735,8 @@ class ConferenceSubmissions(Abstract):
 
     def get_context_data(self, **kwargs):
         context = super(Abstract, self).get_context_data(**kwargs)
-        context['submissions'] = models.Submission.objects.filter(conference_id=self.kwargs['conference_id'])
+        context['submissions'] = models.Submission.objects.filter(conference_id=self.kwargs['conference_id'],
+                                                                  result=True).select_related('submitter__user')
         context['conf'] = models.Conference.objects.filter(id=self.kwargs['conference_id'])[0]
         return context
 
@@ -730,8 +746,10 @@ class SubmissionDetails(Abstract):
 
     def get_context_data(self, **kwargs):
         context = super(Abstract, self).get_context_data(**kwargs)
-        context['submission'] = models.Submission.objects.filter(id=self.kwargs['submission_id']).first()
-        context['participants'] = models.Participants.objects.filter(paper=context['submission'])
+        context['submission'] = models.Submission.objects.filter(id=self.kwargs['submission_id']) \
+            .select_related('submitter__user', 'chosen_section__session_chair__user').first()
+        context['participants'] = models.Participants.objects.filter(paper=context['submission']) \
+            .select_related('actor__user')
 
         return context
 
@@ -743,21 +761,19 @@ class JoinPaper(FormView, Abstract):
 
     def form_valid(self, form):
         data = form.cleaned_data
-        currentUser = models.loggedActor(self)
+        roles = self.submissionRoles()
+        currentUser = roles.actor
 
-        evaluate = models.Participants.alreadyRegistered(models.Participants.objects.all(), models.loggedActor(self))
-        submission = models.Submission.objects.filter(id=self.kwargs['submission_id']).first()
+        submission = roles.submission
 
-        if submission.submitter.id == currentUser.id or (
-                submission.chosen_section.session_chair is not None and
-                submission.chosen_section.session_chair.id == currentUser.id):
-            evaluate = "alreadyRegistered"
+        # the author and the session chair attend anyway
+        evaluate = firstFailure(
+            lambda: Code.ALREADY_REGISTERED if submission.submitter_id == currentUser.id or (
+                submission.chosen_section is not None and
+                submission.chosen_section.session_chair_id == currentUser.id) else Code.OK,
+            lambda: models.Participants.register(submission, currentUser))
 
-        if evaluate == "Ok":
-            models.Participants(
-                paper=submission,
-                actor=currentUser
-            ).save()
+        if evaluate == Code.OK:
             messages.success(self.request, 'You have successfully registered for the paper!')
             return HttpResponseRedirect(
                 '/conferences/submissions/' + str(submission.conference.id) + '/submission-details')
@@ -776,9 +792,9 @@ class AssignSession(Abstract):
     def get_context_data(self, **kwargs):
         context = super(Abstract, self).get_context_data(**kwargs)
 
-        context['sections'] = models.Section.objects.all()
-        context['conferences'] = models.Conference.objects.all()
-        context['members'] = models.PcMemberIn.objects.all()
+        context['conf'] = self.conferenceRoles().conference
+        context['sections'] = models.Section.index().values()
+        context['members'] = conferenceMembers(self.kwargs['conference_id'])
 
         return context
 
@@ -788,24 +804,46 @@ class SessionChairAssignment(FormView, Abstract):
     form_class = forms.SessionChairAssignment
     success_url = reverse_lazy("conferences")
 
+    def get_form_kwargs(self):
+        kwargs = super(SessionChairAssignment, self).get_form_kwargs()
+        kwargs['conference_id'] = self.kwargs['conference_id']
+        return kwargs
+
     def form_valid(self, form):
         data = form.cleaned_data
+        roles = self.conferenceRoles()
 
         section_name = data['section_name']
-        user_name = data['pc_member_name']
 
-        evaluate = [models.Section.exists(section_name),
-                    models.PcMemberIn.userExists(models.PcMemberIn.objects.all(), user_name)]
+        def assign():
+            # the directory is only searched once the chair and the section checked out
+            member = memberNamed(self.kwargs['conference_id'], data['pc_member_name'])
+            if member is None:
+                return Code.USER_DOES_NOT_EXIST
+            section = models.Section.byName(section_name)
+            section.session_chair_id = member.actor_id
+            section.save()
+            return Code.OK
+
+        evaluate = Pipeline() \
+            .check(roles.chairCheck) \
+            .check(lambda: models.Section.exists(section_name)) \
+            .then(assign) \
+            .run()
 
-        if evaluate.count("Ok") != len(evaluate):
-            for evaluation in evaluate:
-                if evaluation != "Ok":
-                    reactToFormAction(evaluation, self.request)
-                    return HttpResponseRedirect('assign-session-chair')
+        if evaluate != Code.OK:
+            reactToFormAction(evaluate, self.request)
         else:
-            section = models.Section.getSection(models.Section.objects.all(), section_name)
-            section.session_chair = models.PcMemberIn.getUser(models.PcMemberIn.objects.all(), user_name).actor
-            section.save()
             messages.success(self.request, "Session chair assigned successfully!")
-            return HttpResponseRedirect('assign-session-chair')
+        return HttpResponseRedirect('/conferences/' + str(self.kwargs['conference_id']) + '/assign-session-chair')
+
+
+class PcMemberSearch(Abstract):
+    http_method_names = ['get']
 
+    def get(self, request, *args, **kwargs):
+        evaluate = self.conferenceRoles().chairCheck()
+        if evaluate != Code.OK:
+            return JsonResponse({'result': evaluate, 'members': []}, status=403)
+        return JsonResponse({'result': evaluate,
+                             'members': searchMembers(self.kwargs['conference_id'], request.GET.get('q', ''))})
@@ -0,0 +1,115 @@
+import functools
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import Template
+
+logger = logging.getLogger("project.performance")
+
+_local = threading.local()
+
+
+class RequestMetrics(object):
+    def __init__(self):
+        self.queries = 0
+        self.queryTime = 0.0
+        self.templateTime = 0.0
+        self.rendering = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # installed as a connection execute wrapper
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queryTime += time.perf_counter() - start
+            self.queries += 1
+
+
+def _timedRender(render):
+    @functools.wraps(render)
+    def timed(self, *args, **kwargs):
+        metrics = getattr(_local, "metrics", None)
+        if metrics is None:
+            return render(self, *args, **kwargs)
+        # a template rendered from inside another one is already being timed
+        metrics.rendering += 1
+        start = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            metrics.rendering -= 1
+            if not metrics.rendering:
+                metrics.templateTime += time.perf_counter() - start
+    timed.instrumented = True
+    return timed
+
+
+def _instrumentTemplates():
+    # Django has no hook around template rendering outside of tests, so wrap the backend's render once
+    if not getattr(Template.render, "instrumented", False):
+        Template.render = _timedRender(Template.render)
+
+
+def _responseSize(response):
+    if response.streaming:
+        length = response.get("Content-Length")
+        return int(length) if length else None
+    return len(response.content)
+
+
+class InstrumentationMiddleware(object):
+    """Logs wall time, queries, template time and response size of requests.
+
+    Every request slower than INSTRUMENTATION["SLOW_REQUEST_MS"] is logged at
+    WARNING, and a INSTRUMENTATION["SAMPLE_RATE"] fraction of the others at
+    INFO, each as one record whose ``metrics`` the JSON formatter writes out.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        options = getattr(settings, "INSTRUMENTATION", {})
+        self.slow = options.get("SLOW_REQUEST_MS", 500) / 1000
+        self.sampleRate = options.get("SAMPLE_RATE", 0)
+        _instrumentTemplates()
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        _local.metrics = metrics
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _local.metrics = None
+        elapsed = time.perf_counter() - start
+
+        slow = elapsed >= self.slow
+        if slow or random.random() < self.sampleRate:
+            self.log(request, response, metrics, elapsed, slow)
+        return response
+
+    def log(self, request, response, metrics, elapsed, slow):
+        match = request.resolver_match
+        record = {
+            "view": match.view_name if match is not None else None,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round(elapsed * 1000, 2),
+            "queries": metrics.queries,
+            "query_ms": round(metrics.queryTime * 1000, 2),
+            "template_ms": round(metrics.templateTime * 1000, 2),
+            "response_bytes": _responseSize(response),
+            "slow": slow,
+        }
+        logger.log(logging.WARNING if slow else logging.INFO, "%s %s %s in %sms, %s queries",
+                   record["method"], record["view"] or record["path"], record["status"],
+                   record["duration_ms"], record["queries"], extra={"metrics": record})
@@ -14,7 +14,12 @@
 #
 
 
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
 
 
 class NewStyleLogMessage(object):
@@ -43,6 +48,145 @@ class StyleAdapter(logging.LoggerAdapter):
             self.logger._log(level, N(msg, *args, **kwargs), (), **log_kwargs)
 
 
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; a record's ``metrics`` extra is merged in."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "metrics", {}))
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+# Asynchronous logging
+#
+# A QueuedHandler only puts records on a queue; a listener thread writes them
+# to the real handlers and flushes those once per batch instead of once per
+# record. Configure it in LOGGING with its targets as cfg:// references, and
+# give it a name that sorts after theirs (dictConfig sets up handlers in name
+# order):
+#
+#     "proj_log_file": {"class": "iss.logger.TimedRotatingFileHandler", ...},
+#     "project_queue": {"()": "iss.logger.QueuedHandler",
+#                       "handlers": ["cfg://handlers.proj_log_file"]},
+#
+# Each process gets its own listener, but the files are shared: the rotating
+# handlers rotate from inside the process, so they only suit one process per
+# file (runserver). Under several workers use WatchedFileHandler and logrotate.
+
+
+class BatchFlushMixin(object):
+    """Leaves flushing to the queue listener, which does it once per batch."""
+
+    def flush(self):
+        pass
+
+    def flushBatch(self):
+        super().flush()
+
+
+class RotatingFileHandler(BatchFlushMixin, logging.handlers.RotatingFileHandler):
+    pass
+
+
+class TimedRotatingFileHandler(BatchFlushMixin, logging.handlers.TimedRotatingFileHandler):
+    pass
+
+
+class WatchedFileHandler(BatchFlushMixin, logging.handlers.WatchedFileHandler):
+    """For files several processes append to: rotation is left to logrotate, the file is reopened after it."""
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    def __init__(self, queue, *handlers, batchSize=100):
+        super().__init__(queue, *handlers, respect_handler_level=True)
+        self.batchSize = batchSize
+
+    def _monitor(self):
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            while len(batch) < self.batchSize:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            for record in batch:
+                if record is self._sentinel:
+                    stopping = True
+                else:
+                    self.handle(record)
+            for handler in self.handlers:
+                getattr(handler, "flushBatch", handler.flush)()
+
+
+class QueuedHandler(logging.handlers.QueueHandler):
+    def __init__(self, handlers, batchSize=100):
+        # dictConfig resolves cfg:// references on item access, not on iteration
+        handlers = [handlers[i] for i in range(len(handlers))]
+        for handler in handlers:
+            if not isinstance(handler, logging.Handler):
+                raise ValueError("QueuedHandler targets must be configured first, "
+                                 "name it so it sorts after {!r}".format(handler))
+        super().__init__(queue.Queue(-1))
+        self.targets = handlers
+        self.batchSize = batchSize
+        self.listener = None
+        self.pid = None
+        self.closed = False
+
+    def startListener(self):
+        # Started by the first record of each process rather than with the
+        # settings: a worker forked by a preloading server inherits this handler
+        # but not the parent's thread, and needs its own queue and listener.
+        # emit runs under the handler lock, so only one thread gets here.
+        if self.pid != os.getpid():
+            self.queue = queue.Queue(-1)
+            self.listener = BatchingQueueListener(self.queue, *self.targets, batchSize=self.batchSize)
+            self.listener.start()
+            self.pid = os.getpid()
+
+    def prepare(self, record):
+        # Resolve the message now, in the caller's thread: a NewStyleLogMessage
+        # (or any argument) may refer to objects that change once we return.
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        if self.closed:
+            # closed at shutdown: write directly rather than into a queue nobody reads
+            record = self.prepare(record)
+            for handler in self.targets:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+                    getattr(handler, "flushBatch", handler.flush)()
+            return
+        self.startListener()
+        super().emit(record)
+
+    def close(self):
+        # logging.shutdown closes handlers newest first, so this drains the
+        # queue while the targets it writes to are still open
+        self.closed = True
+        if self.listener is not None and self.pid == os.getpid():
+            listener, self.listener = self.listener, None
+            listener.stop()
+        super().close()
+
+
 logger = StyleAdapter(logging.getLogger("project"))
 #   Emits "Lazily formatted log entry: 123 foo" in log
 # logger.debug('Lazily formatted entry: {0} {keyword}', 123, keyword='foo')
@@ -16,6 +16,17 @@ STATICFILES_DIRS = [str(BASE_DIR / "static")]
 MEDIA_ROOT = str(BASE_DIR / "media")
 MEDIA_URL = "/media/"
 
+# Uploads are streamed to disk and hashed chunk by chunk, never held in memory
+FILE_UPLOAD_HANDLERS = ["conferences.uploads.StreamingUploadHandler"]
+UPLOAD_MAX_SIZE = 50 * 1024 * 1024
+
+# Submission papers are served by the download view once access is checked.
+# Set to "x-accel-redirect" (nginx) or "x-sendfile" (Apache, lighttpd) to hand
+# the transfer to the front-end server; SENDFILE_URL is nginx's internal
+# location mapped onto MEDIA_ROOT.
+SENDFILE_BACKEND = None
+SENDFILE_URL = "/protected/"
+
 # Use Django templates using the new Django 1.8 TEMPLATES settings
 TEMPLATES = [
     {
@@ -79,6 +90,7 @@ INSTALLED_APPS = (
 )
 
 MIDDLEWARE = [
+    "iss.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -88,6 +100,10 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Requests slower than SLOW_REQUEST_MS are always logged to "project.performance",
+# a SAMPLE_RATE fraction of the others too
+INSTRUMENTATION = {"SLOW_REQUEST_MS": 500, "SAMPLE_RATE": 1.0}
+
 ROOT_URLCONF = "iss.urls"
 
 WSGI_APPLICATION = "iss.wsgi.application"
@@ -101,6 +117,19 @@ DATABASES = {
     "default": env.db()
 }
 
+# Cache
+# https://docs.djangoproject.com/en/dev/topics/cache/
+
+# The conferences app invalidates its caches (listing versions, capabilities,
+# the section index, submission details) from signals, which only reach the
+# cache of the process handling the write. LocMemCache is per process, so it is
+# only right for a single process; production.py shares one memcached instead.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
 # Internationalization
 # https://docs.djangoproject.com/en/dev/topics/i18n/
 
@@ -52,20 +52,48 @@ LOGGING = {
             "datefmt": "%d/%b/%Y %H:%M:%S",
         },
         "simple": {"format": "%(levelname)s %(message)s"},
+        "json": {"()": "iss.logger.JsonFormatter"},
     },
     "handlers": {
+        # rotating handlers: fine for the single runserver process only
         "django_log_file": {
             "level": "DEBUG",
-            "class": "logging.FileHandler",
+            "class": "iss.logger.RotatingFileHandler",
             "filename": str(LOGFILE_ROOT / "django.log"),
+            "maxBytes": 10 * 1024 * 1024,
+            "backupCount": 5,
             "formatter": "verbose",
         },
         "proj_log_file": {
             "level": "DEBUG",
-            "class": "logging.FileHandler",
+            "class": "iss.logger.TimedRotatingFileHandler",
             "filename": str(LOGFILE_ROOT / "project.log"),
+            "when": "midnight",
+            "backupCount": 14,
             "formatter": "verbose",
         },
+        "perf_log_file": {
+            "level": "INFO",
+            "class": "iss.logger.RotatingFileHandler",
+            "filename": str(LOGFILE_ROOT / "performance.log"),
+            "maxBytes": 50 * 1024 * 1024,
+            "backupCount": 5,
+            "formatter": "json",
+        },
+        # The request threads only enqueue records, a thread per queue writes
+        # them to the files above. Named to sort after their targets.
+        "project_queue": {
+            "()": "iss.logger.QueuedHandler",
+            "handlers": ["cfg://handlers.proj_log_file"],
+        },
+        "performance_queue": {
+            "()": "iss.logger.QueuedHandler",
+            "handlers": ["cfg://handlers.perf_log_file"],
+        },
+        "django_queue": {
+            "()": "iss.logger.QueuedHandler",
+            "handlers": ["cfg://handlers.django_log_file"],
+        },
         "console": {
             "level": "DEBUG",
             "class": "logging.StreamHandler",
@@ -74,11 +102,12 @@ LOGGING = {
     },
     "loggers": {
         "django": {
-            "handlers": ["django_log_file"],
+            "handlers": ["django_queue"],
             "propagate": True,
             "level": "DEBUG",
         },
-        "project": {"handlers": ["proj_log_file"], "level": "DEBUG"},
+        "project": {"handlers": ["project_queue"], "level": "DEBUG"},
+        "project.performance": {"handlers": ["performance_queue"], "level": "INFO", "propagate": False},
     },
 }
 
@@ -28,6 +28,11 @@ AUTH_PASSWORD_VALIDATORS = [
 # Must mention ALLOWED_HOSTS in production!
 # ALLOWED_HOSTS = ["iss.com"]
 
+# Every worker must see the same cache, or the signal-based invalidation of one
+# leaves the others serving stale pages (see CACHES in base.py).
+# syntax: CACHE_URL=memcache://127.0.0.1:11211
+CACHES = {"default": env.cache("CACHE_URL", default="memcache://127.0.0.1:11211")}
+
 # Cache the templates in memory for speed-up
 loaders = [
     (
@@ -42,9 +47,15 @@ loaders = [
 TEMPLATES[0]["OPTIONS"].update({"loaders": loaders})
 TEMPLATES[0].update({"APP_DIRS": False})
 
+# Behind nginx, let it send the submission papers (see SENDFILE_URL in base.py)
+# SENDFILE_BACKEND = "x-accel-redirect"
+
 # Define STATIC_ROOT for the collectstatic command
 STATIC_ROOT = str(BASE_DIR.parent / "site" / "static")
 
+# Log every request over a second, and one in a hundred of the rest
+INSTRUMENTATION = {"SLOW_REQUEST_MS": 1000, "SAMPLE_RATE": 0.01}
+
 # Log everything to the logs directory at the top
 LOGFILE_ROOT = BASE_DIR.parent / "logs"
 
@@ -59,21 +70,43 @@ LOGGING = {
             "datefmt": "%d/%b/%Y %H:%M:%S",
         },
         "simple": {"format": "%(levelname)s %(message)s"},
+        "json": {"()": "iss.logger.JsonFormatter"},
     },
     "handlers": {
+        # Every worker appends to the same files, so none of them may rotate
+        # them: logrotate does, and the handlers reopen the new file.
         "proj_log_file": {
             "level": "DEBUG",
-            "class": "logging.FileHandler",
+            "class": "iss.logger.WatchedFileHandler",
             "filename": str(LOGFILE_ROOT / "project.log"),
             "formatter": "verbose",
         },
+        "perf_log_file": {
+            "level": "INFO",
+            "class": "iss.logger.WatchedFileHandler",
+            "filename": str(LOGFILE_ROOT / "performance.log"),
+            "formatter": "json",
+        },
+        # The request threads only enqueue records, a thread per queue writes
+        # them to the files above. Named to sort after their targets.
+        "project_queue": {
+            "()": "iss.logger.QueuedHandler",
+            "handlers": ["cfg://handlers.proj_log_file"],
+        },
+        "performance_queue": {
+            "()": "iss.logger.QueuedHandler",
+            "handlers": ["cfg://handlers.perf_log_file"],
+        },
         "console": {
             "level": "DEBUG",
             "class": "logging.StreamHandler",
             "formatter": "simple",
         },
     },
-    "loggers": {"project": {"handlers": ["proj_log_file"], "level": "DEBUG"}},
+    "loggers": {
+        "project": {"handlers": ["project_queue"], "level": "DEBUG"},
+        "project.performance": {"handlers": ["performance_queue"], "level": "INFO", "propagate": False},
+    },
 }
 
 logging.config.dictConfig(LOGGING)
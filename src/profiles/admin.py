@@ -1,9 +1,13 @@
 from __future__ import unicode_literals
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.http import HttpResponseRedirect
+from django.template.response import TemplateResponse
 from authtools.admin import NamedUserAdmin
+from accounts.forms import ProvisionUsersForm
+from accounts.provisioning import ProvisioningError, provisionUsers, readPeople
 from .models import Profile
 from django.contrib.auth import get_user_model
-from django.urls import reverse
+from django.urls import path, reverse
 from django.utils.html import format_html
 
 User = get_user_model()
@@ -15,6 +19,7 @@ class UserProfileInline(admin.StackedInline):
 
 class NewUserAdmin(NamedUserAdmin):
     inlines = [UserProfileInline]
+    change_list_template = "accounts/admin-user-change-list.html"
     list_display = (
         "is_active",
         "email",
@@ -32,6 +37,35 @@ class NewUserAdmin(NamedUserAdmin):
         # Unicode hex b6 is the Pilcrow sign
         return format_html('<a href="{}">{}</a>'.format(url, "\xb6"))
 
+    def get_urls(self):
+        return [
+            path("provision/", self.admin_site.admin_view(self.provision_view), name="accounts_provision_users"),
+        ] + super().get_urls()
+
+    # Creates a whole CSV worth of accounts in one transaction
+    def provision_view(self, request):
+        if not self.has_add_permission(request):
+            return HttpResponseRedirect(reverse("admin:index"))
+
+        form = ProvisionUsersForm(request.POST or None, request.FILES or None)
+        if form.is_valid():
+            people, errors = readPeople(form.cleaned_data["csv_file"].read())
+            for error in errors:
+                messages.error(request, error)
+            try:
+                result = provisionUsers(people, form.cleaned_data["password"] or None)
+            except ProvisioningError as error:
+                messages.error(request, str(error) + ". Nothing was created, upload the file again.")
+                return HttpResponseRedirect(request.path)
+            if result.skipped:
+                messages.warning(request, "Skipped existing accounts: " + ", ".join(result.skipped))
+            messages.success(request, "Created {} users.".format(len(result.created)))
+            return HttpResponseRedirect(reverse("admin:authtools_user_changelist"))
+
+        context = dict(self.admin_site.each_context(request), form=form, title="Provision users",
+                       opts=self.model._meta)
+        return TemplateResponse(request, "accounts/admin-provision-users.html", context)
+
 
 admin.site.unregister(User)
 admin.site.register(User, NewUserAdmin)